@@ -1,19 +1,4 @@
 from time import sleep
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import (TimeoutException, 
-                                      NoSuchElementException, 
-                                      WebDriverException,
-                                      InvalidSessionIdException,
-                                      StaleElementReferenceException)
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 import random
 import datetime
 import time
@@ -25,8 +10,155 @@ import getpass
 import socket
 import uuid
 import sys
-import msvcrt
 import threading
+import argparse
+import subprocess
+import gzip
+import hashlib
+import html
+import abc
+import signal
+from collections import Counter, deque
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Проход прокрутки главы частями: arguments[0] - часть плана из plan_scroll_pass().
+# Каждый вызов execute_async_script выполняет несколько шагов; состояние прохода
+# (отслеживаемые изображения, общий дедлайн) хранится в window.__mangaRead между вызовами,
+# а между вызовами Python проверяет команды пользователя.
+# Изображения ридера отслеживаются через IntersectionObserver и события load/error:
+# прокрутка не уходит дальше увиденных, но не загруженных страниц, а проход
+# завершается, как только загружены все страницы главы (или истек лимит ожидания).
+SCROLL_PASS_SCRIPT = """
+const plan = arguments[0];
+const done = arguments[arguments.length - 1];
+if (plan.first || !window.__mangaRead) {
+    if (window.__mangaRead && window.__mangaRead.observer) window.__mangaRead.observer.disconnect();
+    const seen = new WeakSet();
+    window.__mangaRead = {
+        started: Date.now(),
+        deadline: Date.now() + plan.deadline_ms,
+        tracked: new WeakSet(),
+        seen: seen,
+        failed: new WeakSet(),
+        steps: 0,
+        observer: ('IntersectionObserver' in window) ? new IntersectionObserver(entries => {
+            entries.forEach(entry => { if (entry.isIntersecting) seen.add(entry.target); });
+        }) : null
+    };
+}
+const state = window.__mangaRead;
+let images = [];
+let index = 0;
+
+// Адрес, который изображение уже показывает; пустая строка - заглушка lazy-loading (data:) или нет src
+function shownSource(img) {
+    const src = img.currentSrc || img.src || '';
+    return src.startsWith('data:') ? '' : src;
+}
+// Настоящий адрес страницы: lazy-loading держит его в data-src, пока не подставит в src
+function wantedSource(img) {
+    const lazy = img.getAttribute('data-src') || img.getAttribute('data-original');
+    if (!lazy) return '';
+    try { return new URL(lazy, document.baseURI).href; } catch (e) { return ''; }
+}
+function isLoaded(img) {
+    if (!img.complete || img.naturalWidth === 0) return false;
+    const shown = shownSource(img);
+    const wanted = wantedSource(img);
+    return shown !== '' && (!wanted || shown === wanted || img.src === wanted);
+}
+// Ошибка могла произойти до track(), когда обработчик error еще не был назначен
+function isFailed(img) {
+    return state.failed.has(img) || (img.complete && img.naturalWidth === 0 && shownSource(img) !== '');
+}
+function isSettled(img) { return isLoaded(img) || isFailed(img); }
+function isSeen(img) {
+    if (state.observer) return state.seen.has(img);
+    return img.getBoundingClientRect().top < window.innerHeight;
+}
+
+function track() {
+    images = Array.from(document.querySelectorAll(plan.image_selector));
+    images.forEach(img => {
+        if (state.tracked.has(img)) return;
+        state.tracked.add(img);
+        img.addEventListener('error', () => state.failed.add(img));
+        img.addEventListener('load', () => state.failed.delete(img));
+        if (state.observer) state.observer.observe(img);
+    });
+    return images;
+}
+
+function allSettled() { return track().every(isSettled); }
+function seenSettled() { return track().every(img => isSettled(img) || !isSeen(img)); }
+
+function waitFor(condition, maxMs, next) {
+    const until = Math.min(Date.now() + maxMs, state.deadline);
+    (function poll() {
+        if (condition() || Date.now() >= until) { next(); return; }
+        setTimeout(poll, 100);
+    })();
+}
+
+function report(finished) {
+    if (finished && state.observer) state.observer.disconnect();
+    track();
+    done({
+        finished: finished,
+        steps: state.steps,
+        expected: images.length,
+        loaded: images.filter(isLoaded).length,
+        failed: images.filter(img => !isLoaded(img) && isFailed(img)).length,
+        elapsed_ms: Date.now() - state.started
+    });
+}
+
+function step() {
+    const expired = Date.now() >= state.deadline;
+    if (expired || (plan.last && index >= plan.steps.length)) {
+        window.scrollTo(0, document.body.scrollHeight);
+        waitFor(allSettled, plan.final_wait_ms, () => report(true));
+        return;
+    }
+    if (index >= plan.steps.length) {
+        report(false);
+        return;
+    }
+    const current = plan.steps[index++];
+    state.steps++;
+    const target = Math.min(document.body.scrollHeight * current.fraction,
+                            document.body.scrollHeight - window.innerHeight);
+    window.scrollTo(0, Math.max(0, target));
+    if (current.click) {
+        document.body.dispatchEvent(new MouseEvent('click', {
+            bubbles: true, clientX: window.innerWidth / 2, clientY: window.innerHeight / 2
+        }));
+    }
+    track();
+    waitFor(() => false, current.pause_ms, () => waitFor(seenSettled, plan.image_wait_ms, step));
+}
+
+step();
+"""
+LOG_FILE = "manga_bot_log.txt"
+MAX_LOG_DELTA_BYTES = 100 * 1024 * 1024
+SCROLL_SCRIPT_TIMEOUT = 120
+# Шагов прокрутки за один вызов execute_async_script: между вызовами проверяются команды пользователя
+SCROLL_CHUNK_STEPS = 4
+# Ожидание элементов, которых обычно нет (сообщение об ошибке входа), секунд
+PROBE_TIMEOUT = 10
+# Код завершения при ошибке настройки или учетных данных: супервизор не перезапускает бота
+EXIT_FATAL = 2
+READER_SELECTOR = ".reader__pages, .reader-container, .reader, .manga-reader, .chapter-content"
+READER_IMAGE_SELECTOR = (
+    ".reader__pages img, .reader__item img, .reader-container img, "
+    ".manga-reader img, .chapter-content img, .reader img"
+)
 
 class UserIdentity:
     """Класс для идентификации пользователя и устройства"""
@@ -63,29 +195,846 @@ class UserIdentity:
         except Exception:
             pass
 
+def load_selenium():
+    """Импортирует Selenium при первом запуске браузера, а не при загрузке модуля"""
+    global webdriver, By, WebDriverWait, EC
+    global TimeoutException, NoSuchElementException, WebDriverException
+    global InvalidSessionIdException, StaleElementReferenceException
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import (TimeoutException, 
+                                          NoSuchElementException, 
+                                          WebDriverException,
+                                          InvalidSessionIdException,
+                                          StaleElementReferenceException)
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+BROWSER_BACKENDS = {}
+
+# Шрифты и видео не нужны для чтения; изображения не блокируются никогда,
+# иначе сайт не засчитает прочитанные страницы.
+BLOCKED_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.mp4", "*.webm", "*.mp3", "*.ogg"]
+
+def register_backend(cls):
+    """Регистрирует класс браузера в BROWSER_BACKENDS под его именем"""
+    BROWSER_BACKENDS[cls.name] = cls
+    return cls
+
+def get_backend(settings):
+    """Создает браузер по browser.name из config.json"""
+    name = str(settings.get('name') or "firefox").lower().strip()
+    if name not in BROWSER_BACKENDS:
+        raise ValueError(f"Unsupported browser: {name} (доступны: {', '.join(sorted(BROWSER_BACKENDS))})")
+    return BROWSER_BACKENDS[name](settings)
+
+class BrowserBackend(abc.ABC):
+    """Браузер: опции запуска, путь к драйверу и поддерживаемые возможности"""
+    name = None
+    supports_headless = True
+    supports_resource_blocking = False
+    supports_profile = True
+    
+    def __init__(self, settings):
+        self.settings = settings
+    
+    def driver_path(self):
+        """browser.driver_path из config.json или загрузка через webdriver-manager"""
+        return self.settings.get('driver_path') or self.download_driver()
+    
+    @abc.abstractmethod
+    def download_driver(self):
+        pass
+    
+    @abc.abstractmethod
+    def create_options(self, headless):
+        pass
+    
+    @abc.abstractmethod
+    def start(self, options):
+        pass
+    
+    def apply_resource_blocking(self, driver):
+        pass
+    
+    def unsupported(self, headless):
+        """Возможности из настроек, которые этот браузер не поддерживает"""
+        missing = []
+        if headless and not self.supports_headless:
+            missing.append("headless")
+        if self.settings.get('block_resources') and not self.supports_resource_blocking:
+            missing.append("block_resources")
+        if self.settings.get('profile') and not self.supports_profile:
+            missing.append("profile")
+        return missing
+    
+    def create_driver(self, headless=True):
+        headless = headless and self.supports_headless
+        driver = self.start(self.create_options(headless))
+        if self.settings.get('block_resources') and self.supports_resource_blocking:
+            self.apply_resource_blocking(driver)
+        return driver
+
+@register_backend
+class FirefoxBackend(BrowserBackend):
+    name = "firefox"
+    supports_resource_blocking = True
+    
+    def download_driver(self):
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    
+    def create_options(self, headless):
+        from selenium.webdriver.firefox.options import Options
+        options = Options()
+        if headless:
+            options.add_argument("--headless")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        if self.settings.get('profile'):
+            options.add_argument("-profile")
+            options.add_argument(self.settings['profile'])
+        if self.settings.get('binary'):
+            options.binary_location = self.settings['binary']
+        if self.settings.get('block_resources'):
+            options.set_preference("gfx.downloadable_fonts.enabled", False)
+            options.set_preference("media.autoplay.default", 5)
+            options.set_preference("media.preload.default", 0)
+        return options
+    
+    def start(self, options):
+        service = webdriver.FirefoxService(self.driver_path())
+        return webdriver.Firefox(service=service, options=options)
+
+class ChromiumBackend(BrowserBackend):
+    """Общая часть браузеров на Chromium"""
+    supports_resource_blocking = True
+    default_binary = None
+    
+    def options_class(self):
+        from selenium.webdriver.chrome.options import Options
+        return Options
+    
+    def create_options(self, headless):
+        options = self.options_class()()
+        if headless:
+            options.add_argument("--headless")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        if self.settings.get('profile'):
+            options.add_argument(f"--user-data-dir={self.settings['profile']}")
+        binary = self.settings.get('binary') or self.default_binary
+        if binary:
+            options.binary_location = binary
+        return options
+    
+    def apply_resource_blocking(self, driver):
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    
+    def download_driver(self):
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    
+    def start(self, options):
+        service = webdriver.ChromeService(self.driver_path())
+        return webdriver.Chrome(service=service, options=options)
+
+@register_backend
+class ChromeBackend(ChromiumBackend):
+    name = "chrome"
+
+@register_backend
+class YandexBackend(ChromiumBackend):
+    name = "yandex"
+    
+    @property
+    def default_binary(self):
+        if os.name == 'nt':
+            return os.path.join(os.getenv('LOCALAPPDATA', ''), 'Yandex', 'YandexBrowser', 'Application', 'browser.exe')
+        return '/usr/bin/yandex-browser'
+
+@register_backend
+class EdgeBackend(ChromiumBackend):
+    name = "edge"
+    
+    def options_class(self):
+        from selenium.webdriver.edge.options import Options
+        return Options
+    
+    def download_driver(self):
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        return EdgeChromiumDriverManager().install()
+    
+    def start(self, options):
+        service = webdriver.EdgeService(self.driver_path())
+        return webdriver.Edge(service=service, options=options)
+
+@register_backend
+class OperaBackend(ChromiumBackend):
+    name = "opera"
+    # operadriver не работает в headless-режиме и не гарантирует CDP-команды
+    supports_headless = False
+    supports_resource_blocking = False
+    
+    def download_driver(self):
+        from webdriver_manager.opera import OperaDriverManager
+        return OperaDriverManager().install()
+
+def browser_processes(driver):
+    """Возвращает процессы драйвера и браузера (нужен psutil)"""
+    if psutil is None or driver is None:
+        return []
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        return [root] + root.children(recursive=True)
+    except Exception:
+        return []
+
+def browser_rss_mb(driver):
+    """Суммарная резидентная память драйвера и браузера в МБ"""
+    processes = browser_processes(driver)
+    if not processes:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+def kill_browser_processes(driver):
+    """Принудительно завершает браузер и его драйвер"""
+    processes = browser_processes(driver)
+    if processes:
+        for process in reversed(processes):
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        return
+    try:
+        driver.service.process.kill()
+    except Exception:
+        pass
+
+class DriverWatchdog:
+    """Сторожевой поток: следит за дедлайнами вызовов WebDriver"""
+    def __init__(self, on_timeout, grace=10, poll_interval=1.0):
+        self.on_timeout = on_timeout
+        self.grace = grace
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._current = None
+        self._tripped = False
+        self._thread = threading.Thread(target=self._run, name="driver_watchdog", daemon=True)
+        self._thread.start()
+
+    @contextmanager
+    def guard(self, operation, timeout):
+        """Регистрирует операцию с дедлайном timeout + grace секунд"""
+        with self._lock:
+            previous = self._current
+            self._current = (operation, time.time() + timeout + self.grace)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._current = previous
+
+    def consume_trip(self):
+        """Возвращает True, если сработал таймер, и сбрасывает флаг"""
+        with self._lock:
+            tripped = self._tripped
+            self._tripped = False
+            return tripped
+
+    def _run(self):
+        while True:
+            sleep(self.poll_interval)
+            with self._lock:
+                if not self._current or time.time() < self._current[1]:
+                    continue
+                operation = self._current[0]
+                self._current = None
+                self._tripped = True
+            try:
+                self.on_timeout(operation)
+            except Exception as e:
+                print(f"Ошибка сторожевого потока: {str(e)}")
+
+class StackSampler:
+    """Профилировщик: периодически снимает стеки всех потоков и пишет их в collapsed-формате для flamegraph"""
+    def __init__(self, directory="profiles", interval=0.05, rotate_seconds=300, keep_files=24):
+        self.directory = directory
+        self.interval = interval
+        self.rotate_seconds = rotate_seconds
+        self.keep_files = keep_files
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive() and not self._stop.is_set()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return False
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop,), name="stack_sampler", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self, timeout=2):
+        """Останавливает выборку и дописывает последний файл"""
+        with self._lock:
+            if not self.running:
+                return False
+            self._stop.set()
+            thread = self._thread
+        thread.join(timeout)
+        return True
+
+    def toggle(self):
+        """Переключает профилировщик; возвращает True, если он теперь включен"""
+        if self.running:
+            self.stop()
+            return False
+        return self.start()
+
+    @staticmethod
+    def collapse(frame):
+        """Стек потока одной строкой: функции от корня к вершине через ';'"""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _run(self, stop):
+        own_ident = threading.get_ident()
+        counts = Counter()
+        window_start = time.time()
+        while not stop.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    counts[f"{thread_names.get(ident, ident)};{self.collapse(frame)}"] += 1
+            if time.time() - window_start >= self.rotate_seconds:
+                self._flush(counts, window_start)
+                counts = Counter()
+                window_start = time.time()
+        self._flush(counts, window_start)
+
+    def _flush(self, counts, window_start):
+        if not counts:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            stamp = datetime.datetime.fromtimestamp(window_start).strftime("%Y%m%d_%H%M%S")
+            with open(os.path.join(self.directory, f"stacks_{stamp}.txt"), "w", encoding='utf-8') as f:
+                for stack, count in counts.most_common():
+                    f.write(f"{stack} {count}\n")
+            files = sorted(name for name in os.listdir(self.directory) if name.startswith("stacks_"))
+            for name in files[:-self.keep_files]:
+                os.remove(os.path.join(self.directory, name))
+        except Exception as e:
+            print(f"Ошибка записи профиля: {str(e)}")
+
+def interruptible_sleep(seconds, should_stop=None):
+    """Спит до seconds секунд, проверяя should_stop раз в секунду. False - если прервано"""
+    end_time = time.time() + seconds
+    while True:
+        if should_stop and should_stop():
+            return False
+        remaining = end_time - time.time()
+        if remaining <= 0:
+            return True
+        sleep(min(1.0, remaining))
+
+def is_retryable_error(error):
+    """Классифицирует ошибку: имеет ли смысл повторять операцию"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, LoginError):
+        return not error.rejected
+    if isinstance(error, requests.exceptions.HTTPError):
+        if error.response is None:
+            return True
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    selenium_errors = sys.modules.get('selenium.common.exceptions')
+    if selenium_errors:
+        if isinstance(error, (selenium_errors.InvalidArgumentException, selenium_errors.InvalidSelectorException)):
+            return False
+        if isinstance(error, selenium_errors.WebDriverException):
+            return True
+    return False
+
+class CircuitOpenError(Exception):
+    """Цепь разомкнута: сервис считается недоступным, вызов не выполняется"""
+
+class LoginError(Exception):
+    """Вход не выполнен; rejected - сайт отклонил учетные данные, повторять бессмысленно"""
+    def __init__(self, message, rejected=False):
+        super().__init__(message)
+        self.rejected = rejected
+
+class CircuitBreaker:
+    """Размыкает цепь после серии ошибок и пропускает пробный вызов после паузы"""
+    def __init__(self, name, failure_threshold=5, reset_timeout=120):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def retry_in(self):
+        """Секунды до следующего пробного вызова (0 - цепь замкнута)"""
+        with self._lock:
+            if self.opened_at is None:
+                return 0
+            return max(0, self.opened_at + self.reset_timeout - time.time())
+
+    def allow(self):
+        """Разрешает вызов; в полуоткрытом состоянии пропускает один пробный"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at >= self.reset_timeout:
+                self.opened_at = time.time()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+
+class RetryPolicy:
+    """Повторы с декоррелированным джиттером, бюджетом времени и размыканием цепи"""
+    def __init__(self, name, max_attempts=3, base_delay=1.0, max_delay=30.0, budget=None,
+                 breaker=None, classify=is_retryable_error):
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.breaker = breaker
+        self.classify = classify
+
+    def next_delay(self, previous=None):
+        """Следующая пауза: decorrelated jitter, min(max, U(base, previous * 3)); первая - из U(base, base * 3)"""
+        if previous is None:
+            previous = self.base_delay
+        return min(self.max_delay, random.uniform(self.base_delay, previous * 3))
+
+    def run(self, func, on_error=None, should_stop=None, max_attempts=None):
+        """Вызывает func с повторами. on_error(error, attempt, attempts, will_retry)"""
+        attempts = max_attempts or self.max_attempts
+        if self.breaker and not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name}: цепь '{self.breaker.name}' разомкнута")
+        
+        delay = None
+        slept = 0
+        for attempt in range(1, attempts + 1):
+            try:
+                result = func()
+            except Exception as e:
+                retryable = self.classify(e)
+                if self.breaker and retryable:
+                    self.breaker.record_failure()
+                
+                delay = self.next_delay(delay)
+                will_retry = (
+                    retryable
+                    and attempt < attempts
+                    and (self.budget is None or slept + delay <= self.budget)
+                    and (self.breaker is None or self.breaker.retry_in() == 0)
+                )
+                if on_error:
+                    on_error(e, attempt, attempts, will_retry)
+                if not will_retry:
+                    raise
+                if not interruptible_sleep(delay, should_stop):
+                    raise
+                slept += delay
+            else:
+                if self.breaker:
+                    self.breaker.record_success()
+                return result
+
+DEFAULT_CIRCUIT_BREAKERS = {
+    "site": {"failure_threshold": 6, "reset_timeout": 120},
+    "telegram": {"failure_threshold": 3, "reset_timeout": 300},
+}
+
+DEFAULT_RETRY_POLICIES = {
+    "page_load": {"max_attempts": 3, "base_delay": 2, "max_delay": 30, "budget": 60, "breaker": "site"},
+    "telegram": {"max_attempts": 3, "base_delay": 1, "max_delay": 10, "budget": 15, "breaker": "telegram"},
+    "login": {"max_attempts": 3, "base_delay": 5, "max_delay": 60},
+    # Для основного цикла используется только next_delay: пауза после ошибки
+    "main_loop": {"base_delay": 5, "max_delay": 300},
+}
+
+def build_retry_policies(config=None):
+    """Создает политики повторов; config['breakers'] и config['policies'] переопределяют значения"""
+    config = config or {}
+    breakers = {}
+    for name, defaults in DEFAULT_CIRCUIT_BREAKERS.items():
+        settings = {**defaults, **config.get('breakers', {}).get(name, {})}
+        breakers[name] = CircuitBreaker(name, **settings)
+    
+    policies = {}
+    for name, defaults in DEFAULT_RETRY_POLICIES.items():
+        settings = {**defaults, **config.get('policies', {}).get(name, {})}
+        breaker_name = settings.pop('breaker', None)
+        policies[name] = RetryPolicy(name, breaker=breakers.get(breaker_name), **settings)
+    return policies
+
+def page_type(url):
+    """Определяет тип страницы mangabuff по URL"""
+    path = url.split('://', 1)[-1].split('?', 1)[0].rstrip('/')
+    parts = path.split('/')[1:]
+    if not parts:
+        return "home"
+    if parts[0] == "login":
+        return "login"
+    if parts[0] == "manga":
+        return {1: "catalog", 2: "title"}.get(len(parts), "chapter")
+    return "other"
+
+class LatencyTracker:
+    """Скользящие выборки задержек по типам страниц и селекторам для расчета таймаутов"""
+    def __init__(self, window=200, min_samples=20, margin=1.5, floor=5, samples=None):
+        self.window = window
+        self.min_samples = min_samples
+        self.margin = margin
+        self.floor = floor
+        self.samples = {}
+        self.extended = {}
+        for key, values in (samples or {}).items():
+            self.samples[key] = deque(values, maxlen=window)
+
+    def record(self, key, seconds):
+        self.samples.setdefault(key, deque(maxlen=self.window)).append(round(seconds, 3))
+        if key in self.extended:
+            self.extended[key] /= 2
+            if self.extended[key] <= self.floor:
+                del self.extended[key]
+
+    def record_timeout(self, key, timeout, ceiling):
+        """Операция не уложилась в таймаут: задержку не знаем, поэтому удваиваем таймаут ключа (до ceiling)"""
+        self.extended[key] = min(ceiling, max(timeout, self.extended.get(key, 0)) * 2)
+
+    def percentile(self, key, q):
+        values = sorted(self.samples.get(key, ()))
+        if not values:
+            return None
+        index = max(0, min(len(values) - 1, int(len(values) * q + 0.999999) - 1))
+        return values[index]
+
+    def timeout(self, key, default, ceiling):
+        """p99 * margin в пределах [floor, ceiling]; default - пока данных мало. После таймаутов - не меньше удвоенного"""
+        if len(self.samples.get(key, ())) < self.min_samples:
+            observed = default
+        else:
+            observed = max(self.floor, self.percentile(key, 0.99) * self.margin)
+        return min(ceiling, max(observed, self.extended.get(key, 0)))
+
+    def to_dict(self):
+        return {key: list(values) for key, values in self.samples.items()}
+
+class ErrorDigest:
+    """Группирует повторяющиеся ошибки по отпечатку (нормализованный текст + место вызова)"""
+    def __init__(self, quiet_period=3600):
+        self.quiet_period = quiet_period
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(message):
+        """Убирает из текста ошибки изменчивые части: URL, числа, идентификаторы"""
+        text = re.sub(r'https?://\S+', '<url>', message)
+        text = re.sub(r'0x[0-9a-fA-F]+|[0-9a-fA-F]{16,}|\d+', '#', text)
+        return re.sub(r'\s+', ' ', text).strip()[:200]
+
+    def record(self, message, call_site):
+        """Учитывает ошибку. True - первое появление отпечатка, о нем нужно сообщить сразу"""
+        normalized = self.normalize(message)
+        fingerprint = hashlib.sha1(f"{call_site}|{normalized}".encode('utf-8')).hexdigest()[:12]
+        now = time.time()
+        with self._lock:
+            entry = self.entries.get(fingerprint)
+            if entry is None or now - entry['last_seen'] >= self.quiet_period:
+                self.entries[fingerprint] = {
+                    'text': normalized,
+                    'call_site': call_site,
+                    'first_seen': now,
+                    'last_seen': now,
+                    'pending': 0
+                }
+                return True
+            entry['last_seen'] = now
+            entry['pending'] += 1
+            return False
+
+    def flush(self):
+        """Возвращает накопленные повторы (по убыванию числа) и сбрасывает счетчики"""
+        now = time.time()
+        with self._lock:
+            pending = [dict(entry) for entry in self.entries.values() if entry['pending']]
+            for fingerprint, entry in list(self.entries.items()):
+                entry['pending'] = 0
+                if now - entry['last_seen'] >= self.quiet_period:
+                    del self.entries[fingerprint]
+        return sorted(pending, key=lambda entry: entry['pending'], reverse=True)
+
+def parse_chapter_list(manga_slug, page_html):
+    """Извлекает отсортированный список (том, глава) из HTML страницы манги"""
+    pattern = re.compile(rf'/manga/{re.escape(manga_slug)}/(\d+)/(\d+)')
+    return sorted({(int(volume), int(chapter)) for volume, chapter in pattern.findall(page_html)})
+
+class ChapterChangeDetector:
+    """Проверяет появление новых глав по HTTP (If-None-Match/If-Modified-Since и хеш списка глав)"""
+    def __init__(self, fingerprints=None, timeout=30):
+        self.session = requests.Session()
+        self.fingerprints = dict(fingerprints or {})
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def use_browser_session(self, cookies, user_agent=None):
+        """Переносит cookies (и User-Agent) браузера в HTTP-сессию"""
+        for cookie in cookies or []:
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+
+    @staticmethod
+    def digest(chapters):
+        return hashlib.sha1(json.dumps(chapters).encode('utf-8')).hexdigest()
+
+    def known_count(self, manga_slug):
+        with self._lock:
+            return self.fingerprints.get(manga_slug, {}).get('chapters', 0)
+
+    def remember(self, manga_slug, chapters):
+        """Запоминает список глав, полученный браузером, как базовый для сравнения"""
+        with self._lock:
+            entry = self.fingerprints.setdefault(manga_slug, {})
+            entry['digest'] = self.digest(chapters)
+            entry['chapters'] = len(chapters)
+
+    def check(self, manga_slug):
+        """Возвращает список глав, если он изменился, иначе None"""
+        with self._lock:
+            entry = dict(self.fingerprints.get(manga_slug, {}))
+        
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        
+        response = self.session.get(f"https://mangabuff.ru/manga/{manga_slug}", headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        
+        chapters = parse_chapter_list(manga_slug, response.text)
+        if not chapters:
+            raise ValueError(f"список глав {manga_slug} не найден в HTML")
+        
+        digest = self.digest(chapters)
+        with self._lock:
+            self.fingerprints[manga_slug] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'digest': digest,
+                'chapters': len(chapters)
+            }
+        return chapters if digest != entry.get('digest') else None
+
+    def snapshot(self):
+        with self._lock:
+            return {slug: dict(entry) for slug, entry in self.fingerprints.items()}
+
+def read_chapter_counts(processed_chapters):
+    """Число прочитанных глав по тайтлам из ключей вида slug_том_глава"""
+    counts = Counter()
+    for chapter_key in processed_chapters:
+        parts = chapter_key.rsplit('_', 2)
+        if len(parts) == 3:
+            counts[parts[0]] += 1
+    return counts
+
+class TitleScheduler:
+    """Выбирает следующий тайтл по политике scheduler.policy и истории загрузок"""
+    POLICIES = ("random", "shortest_remaining", "resume_partial", "reliable")
+    
+    def __init__(self, policy="resume_partial", explore=0.1, unknown_chapters=100, max_failure_rate=0.5,
+                 half_life_hours=24):
+        self.policy = policy if policy in self.POLICIES else "random"
+        self.explore = explore
+        self.unknown_chapters = unknown_chapters
+        self.max_failure_rate = max_failure_rate
+        self.half_life = half_life_hours * 3600
+        self.stats = {}
+        self.unconfirmed = []
+    
+    def restore(self, stats):
+        self.stats = {slug: dict(entry) for slug, entry in (stats or {}).items()}
+    
+    def snapshot(self):
+        return {slug: dict(entry) for slug, entry in self.stats.items()}
+    
+    def decayed(self, entry, now=None):
+        """(загрузки, ошибки) тайтла с экспоненциальным забыванием: вес вдвое меньше каждые half_life"""
+        if not entry:
+            return 0, 0
+        now = now or time.time()
+        age = now - entry.get('updated', now)
+        weight = 0.5 ** (age / self.half_life) if self.half_life else 1
+        return entry['loads'] * weight, entry['failures'] * weight
+    
+    def _add(self, manga_slug, success):
+        now = time.time()
+        loads, failures = self.decayed(self.stats.get(manga_slug), now)
+        self.stats[manga_slug] = {
+            'loads': round(loads + 1, 3),
+            'failures': round(failures + (0 if success else 1), 3),
+            'updated': now
+        }
+    
+    def record_load(self, manga_slug, success):
+        """Учитывает загрузку главы или списка глав тайтла. Ошибка засчитывается после следующей
+        успешной загрузки любой страницы: до тех пор она может оказаться недоступностью всего сайта"""
+        if not success:
+            self.unconfirmed.append(manga_slug)
+            return
+        for failed_slug in self.unconfirmed:
+            self._add(failed_slug, False)
+        self.unconfirmed = []
+        self._add(manga_slug, True)
+    
+    def discard_unconfirmed(self):
+        """Сайт недоступен целиком: неподтвержденные ошибки тайтлам не засчитываются"""
+        self.unconfirmed = []
+    
+    def failure_rate(self, manga_slug):
+        """Доля неудачных загрузок, сглаженная к средней по всем тайтлам"""
+        now = time.time()
+        totals = [self.decayed(entry, now) for entry in self.stats.values()]
+        prior = (sum(failures for _, failures in totals) + 1) / (sum(loads for loads, _ in totals) + 2)
+        loads, failures = self.decayed(self.stats.get(manga_slug), now)
+        return (failures + 2 * prior) / (loads + 2)
+    
+    def choose(self, candidates, processed_chapters, known_count):
+        """Возвращает тайтл для чтения; known_count(slug) - число глав тайтла (0 - неизвестно)"""
+        read = read_chapter_counts(processed_chapters)
+        candidates = list(dict.fromkeys(candidates))
+        if self.policy == "resume_partial":
+            candidates += [slug for slug in read if slug not in candidates]
+        if not candidates:
+            return None
+        
+        def remaining(slug):
+            total = known_count(slug)
+            return max(total - read[slug], 0) if total else None
+        
+        candidates = [slug for slug in candidates if remaining(slug) != 0] or candidates
+        if self.policy == "random" or random.random() < self.explore:
+            return random.choice(candidates)
+        
+        # Тайтлы, которые чаще не грузятся, чем грузятся, выбираются только случайной разведкой
+        candidates = [slug for slug in candidates if self.failure_rate(slug) <= self.max_failure_rate] or candidates
+        
+        def expected_cost(slug):
+            chapters_left = remaining(slug)
+            if chapters_left is None:
+                chapters_left = self.unknown_chapters
+            return chapters_left / max(1 - self.failure_rate(slug), 0.05)
+        
+        if self.policy == "resume_partial":
+            key = lambda slug: (read[slug] == 0, expected_cost(slug))
+        elif self.policy == "reliable":
+            key = lambda slug: (round(self.failure_rate(slug), 2), expected_cost(slug))
+        else:
+            key = expected_cost
+        return min(candidates, key=lambda slug: (key(slug), random.random()))
+
+class BrowserRecyclePolicy:
+    """Политика плановой замены браузера по памяти, числу переходов и возрасту сессии"""
+    def __init__(self, max_rss_mb=1500, max_navigations=400, max_age_minutes=180):
+        self.max_rss_mb = max_rss_mb
+        self.max_navigations = max_navigations
+        self.max_age_minutes = max_age_minutes
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает счетчики для новой сессии браузера"""
+        self.started_at = time.time()
+        self.navigations = 0
+
+    def record_navigation(self):
+        self.navigations += 1
+
+    def check(self, rss_mb=None):
+        """Возвращает причину для перезапуска браузера или None"""
+        if self.max_rss_mb and rss_mb is not None and rss_mb >= self.max_rss_mb:
+            return f"память браузера {rss_mb:.0f} МБ (лимит {self.max_rss_mb} МБ)"
+        if self.max_navigations and self.navigations >= self.max_navigations:
+            return f"переходов {self.navigations} (лимит {self.max_navigations})"
+        age_minutes = (time.time() - self.started_at) / 60
+        if self.max_age_minutes and age_minutes >= self.max_age_minutes:
+            return f"возраст сессии {age_minutes:.0f} мин (лимит {self.max_age_minutes} мин)"
+        return None
+
 class TelegramNotifier:
-    def __init__(self, token, chat_id, user_identity):
+    def __init__(self, token, chat_id, user_identity, retry_policy=None):
         self.token = token
         self.chat_id = chat_id
         self.user_identity = user_identity
         self.base_url = f"https://api.telegram.org/bot{self.token}"
         self.session = requests.Session()
+        self.retry_policy = retry_policy or build_retry_policies()['telegram']
         
-    def _make_request(self, method, params=None, files=None, timeout=30, max_retries=3):
-        for attempt in range(max_retries):
-            try:
-                url = f"{self.base_url}/{method}"
-                if files:
-                    response = self.session.post(url, files=files, data=params, timeout=timeout)
-                else:
-                    response = self.session.post(url, json=params, timeout=timeout)
-                response.raise_for_status()
-                return response.json()
-            except requests.exceptions.RequestException as e:
-                if attempt == max_retries - 1:
-                    print(f"Telegram API final error after {max_retries} attempts: {str(e)}")
-                    return None
-                sleep(2 ** (attempt + 1))
+    def _make_request(self, method, params=None, files=None, timeout=30, max_retries=None):
+        url = f"{self.base_url}/{method}"
+        
+        def send():
+            if files:
+                response = self.session.post(url, files=files, data=params, timeout=timeout)
+            else:
+                response = self.session.post(url, json=params, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        
+        try:
+            return self.retry_policy.run(send, max_attempts=max_retries)
+        except CircuitOpenError:
+            return None
+        except requests.exceptions.RequestException as e:
+            print(f"Telegram API final error: {str(e)}")
+            return None
                 
     def send_message(self, text, disable_notification=False):
         user_info = (
@@ -103,29 +1052,236 @@ class TelegramNotifier:
         }
         return self._make_request('sendMessage', params)
 
+    def send_photo(self, photo, caption=None):
+        """Отправляет фото: путь к файлу или bytes"""
+        return self._send_file('sendPhoto', 'photo', photo, caption, filename="screenshot.png")
+
+    def send_document(self, document, caption=None, filename=None):
+        """Отправляет документ: путь к файлу или bytes"""
+        return self._send_file('sendDocument', 'document', document, caption, filename)
+
+    def _send_file(self, method, field, content, caption=None, filename=None):
+        if not isinstance(content, (bytes, bytearray)):
+            filename = filename or os.path.basename(content)
+            with open(content, 'rb') as f:
+                content = f.read()
+        
+        params = {'chat_id': self.chat_id}
+        if caption:
+            params['caption'] = caption[:1024]
+        return self._make_request(method, params, files={field: (filename or field, bytes(content))}, timeout=120)
+
+class Supervisor:
+    """Запускает MangaReader в дочернем процессе и перезапускает его при падении или потере пульса"""
+    DRIVER_NAMES = ("geckodriver", "chromedriver", "msedgedriver", "operadriver")
+    BROWSER_NAMES = ("firefox", "chrome", "chromium", "msedge", "opera", "yandex", "browser")
+
+    def __init__(self, heartbeat_file="manga_heartbeat.json", heartbeat_timeout=600,
+                 base_cooldown=5, max_cooldown=300, stable_after=600):
+        self.heartbeat_file = os.path.abspath(heartbeat_file)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.stable_after = stable_after
+        self.process = None
+
+    def log(self, message):
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[SUPERVISOR][{timestamp}] {message}", flush=True)
+
+    def run(self):
+        """Цикл надзора; возвращает код завершения"""
+        cooldown = None
+        try:
+            while True:
+                self.reap_orphans()
+                started = time.time()
+                code = self.run_child()
+                if code == 0:
+                    self.log("Бот завершил работу штатно")
+                    return 0
+                if code == EXIT_FATAL:
+                    self.log("Бот остановлен из-за ошибки настройки или учетных данных, перезапуск не поможет")
+                    return code
+                
+                if time.time() - started >= self.stable_after:
+                    cooldown = None
+                cooldown = self.base_cooldown if cooldown is None else min(self.max_cooldown, cooldown * 2)
+                self.log(f"Бот завершился с кодом {code}, перезапуск через {cooldown} с")
+                sleep(cooldown)
+        except KeyboardInterrupt:
+            self.log("Остановлено пользователем")
+            if self.process and self.process.poll() is None:
+                self.stop_child()
+            return 0
+
+    def run_child(self):
+        """Запускает бота и ждет его завершения, следя за пульсом"""
+        try:
+            os.remove(self.heartbeat_file)
+        except OSError:
+            pass
+        
+        env = dict(os.environ, MANGAREAD_HEARTBEAT_FILE=self.heartbeat_file, MANGAREAD_NON_INTERACTIVE='1')
+        started = time.time()
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--non-interactive"],
+            env=env
+        )
+        self.log(f"Запущен бот, PID {self.process.pid}")
+        
+        descendants = set()
+        try:
+            while True:
+                try:
+                    return self.process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
+                
+                descendants |= self.child_processes()
+                silence = time.time() - max(started, self.last_heartbeat())
+                if silence > self.heartbeat_timeout:
+                    self.log(f"Нет пульса {silence:.0f} с, перезапускаем бота")
+                    self.stop_child()
+                    return self.process.wait()
+        finally:
+            self.kill_processes(descendants)
+
+    def last_heartbeat(self):
+        """Время последнего прогресса основного потока бота (0 - пульса еще не было)"""
+        try:
+            with open(self.heartbeat_file, encoding='utf-8') as f:
+                return json.load(f).get("progress", 0)
+        except (OSError, ValueError):
+            return 0
+
+    def child_processes(self):
+        if psutil is None:
+            return set()
+        try:
+            return set(psutil.Process(self.process.pid).children(recursive=True))
+        except psutil.Error:
+            return set()
+
+    def stop_child(self):
+        descendants = self.child_processes()
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.kill_processes(descendants)
+
+    def kill_processes(self, processes):
+        for process in processes:
+            try:
+                if process.is_running():
+                    process.kill()
+            except psutil.Error:
+                pass
+
+    def reap_orphans(self):
+        """Завершает драйверы и браузеры, оставшиеся от прежних запусков бота под этим супервизором.
+        Свои процессы узнаются по MANGAREAD_HEARTBEAT_FILE в окружении, которое они наследуют от бота"""
+        if psutil is None:
+            return
+        try:
+            username = psutil.Process().username()
+        except psutil.Error:
+            return
+        orphans = []
+        for process in psutil.process_iter(['name', 'username']):
+            try:
+                name = (process.info['name'] or '').lower()
+                if process.info['username'] != username:
+                    continue
+                if not name.startswith(self.DRIVER_NAMES + self.BROWSER_NAMES):
+                    continue
+                if process.environ().get('MANGAREAD_HEARTBEAT_FILE') == self.heartbeat_file:
+                    orphans.append(process)
+            except psutil.Error:
+                continue
+        if orphans:
+            self.log(f"Завершаем осиротевшие процессы драйвера/браузера: {len(orphans)}")
+            self.kill_processes(orphans)
+
 class MangaReader:
-    def __init__(self):
+    def __init__(self, non_interactive=False):
         # Идентификация пользователя
         self.user_identity = UserIdentity()
         self.user_identity.save_user_id()
         
+        self.config = self.load_config()
+        self.non_interactive = (
+            non_interactive
+            or self.config.get('non_interactive', False)
+            or os.getenv('MANGAREAD_NON_INTERACTIVE') == '1'
+        )
+        self.metrics = Counter()
+        self.last_progress = time.time()
+        self.heartbeat_file = os.getenv('MANGAREAD_HEARTBEAT_FILE')
+        if self.heartbeat_file:
+            threading.Thread(target=self.heartbeat_loop, name="heartbeat", daemon=True).start()
+        self.retry_policies = build_retry_policies(self.config.get('retry'))
+        self.site_breaker = self.retry_policies['page_load'].breaker
+        
         # Инициализация TelegramNotifier перед driver
         self.telegram = None
         try:
-            if os.path.exists('config.json'):
-                with open('config.json') as f:
-                    config = json.load(f)
+            if 'telegram' in self.config:
                 self.telegram = TelegramNotifier(
-                    config['telegram']['token'], 
-                    config['telegram']['chat_id'], 
-                    user_identity=self.user_identity
+                    self.config['telegram']['token'], 
+                    self.config['telegram']['chat_id'], 
+                    user_identity=self.user_identity,
+                    retry_policy=self.retry_policies['telegram']
                 )
                 self.telegram.send_message("🤖 MangaBot запущен и готов к работе!")
         except Exception as e:
             print(f"Ошибка инициализации Telegram: {str(e)}")
         
+        alerts_config = self.config.get('alerts', {})
+        self.error_digest = ErrorDigest(quiet_period=alerts_config.get('quiet_minutes', 60) * 60)
+        self.digest_interval = alerts_config.get('digest_minutes', 10) * 60
+        if self.telegram:
+            threading.Thread(target=self.error_digest_loop, name="error_digest", daemon=True).start()
+        
+        profiler_config = self.config.get('profiler', {})
+        self.profiler = StackSampler(
+            directory=profiler_config.get('directory', "profiles"),
+            interval=profiler_config.get('interval_ms', 50) / 1000,
+            rotate_seconds=profiler_config.get('rotate_minutes', 5) * 60,
+            keep_files=profiler_config.get('keep_files', 24)
+        )
+        if profiler_config.get('enabled', False):
+            self.profiler.start()
+        if hasattr(signal, 'SIGUSR1') and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.toggle_profiler())
+        
         # Настройка браузера
+        recycle_config = self.config.get('browser', {}).get('recycle', {})
+        self.recycle_policy = BrowserRecyclePolicy(
+            max_rss_mb=recycle_config.get('max_rss_mb', 1500),
+            max_navigations=recycle_config.get('max_navigations', 400),
+            max_age_minutes=recycle_config.get('max_age_minutes', 180)
+        )
+        timeouts_config = self.config.get('timeouts', {})
+        self.latency = LatencyTracker(
+            window=timeouts_config.get('window', 200),
+            min_samples=timeouts_config.get('min_samples', 20),
+            margin=timeouts_config.get('margin', 1.5),
+            floor=timeouts_config.get('floor', 5)
+        )
+        self.wait_ceiling = timeouts_config.get('wait_ceiling', 90)
+        self.page_load_ceiling = timeouts_config.get('page_load_ceiling', 180)
+        
+        load_selenium()
         self.driver = None
+        self.browser_backend = None
+        self.cookie_snapshot = []
+        self.watchdog = DriverWatchdog(
+            self.on_driver_hang,
+            grace=self.config.get('browser', {}).get('watchdog_grace', 10)
+        )
         self.initialize_driver()
         
         # Состояние
@@ -135,8 +1291,32 @@ class MangaReader:
         self.current_volume = 1
         self.current_chapter = 1
         self.processed_chapters = set()
+        self.favourite_titles = set()
+        self.favourite_checked = set()
+        report_config = self.config.get('report', {})
+        self.report_interval = report_config.get('interval_minutes', 60) * 60
+        self.report_every_chapters = report_config.get('every_chapters', 10)
+        self.report_cursor = 0
+        self.last_report_at = time.time()
+        self.last_report_chapters = 0
+        self.report_thread = None
+        self.change_detector = ChapterChangeDetector()
+        scheduler_config = self.config.get('scheduler', {})
+        scheduler_policy = scheduler_config.get('policy', "resume_partial")
+        if scheduler_policy not in TitleScheduler.POLICIES:
+            self.log_message(f"Неизвестная политика выбора тайтлов {scheduler_policy}, используем random")
+        self.scheduler = TitleScheduler(
+            policy=scheduler_policy,
+            explore=scheduler_config.get('explore', 0.1),
+            unknown_chapters=scheduler_config.get('unknown_chapters', 100),
+            max_failure_rate=scheduler_config.get('max_failure_rate', 0.5),
+            half_life_hours=scheduler_config.get('half_life_hours', 24)
+        )
+        self.watch_interval = self.config.get('watch', {}).get('interval_minutes', 30) * 60
+        self.watch_lock = threading.Lock()
+        self.pending_titles = deque()
         self.login_attempts = 0
-        self.max_login_attempts = 3
+        self.login_rejected = False
         self.last_error = None
         self.is_logged_in = False
         self.email = None
@@ -146,8 +1326,34 @@ class MangaReader:
         self.user_interrupt = False
         self.switch_manga_flag = False
 
-    def initialize_driver(self, browser_name="firefox"):
-        """Инициализирует драйвер браузера с обработкой ошибок"""
+    def mark_progress(self):
+        """Отмечает, что основной поток жив и продвигается (для пульса супервизора)"""
+        self.last_progress = time.time()
+
+    def heartbeat_loop(self):
+        """Фоновый поток: пишет пульс для супервизора"""
+        while True:
+            try:
+                temp_file = f"{self.heartbeat_file}.tmp"
+                with open(temp_file, "w", encoding='utf-8') as f:
+                    json.dump({"pid": os.getpid(), "progress": self.last_progress, "written": time.time()}, f)
+                os.replace(temp_file, self.heartbeat_file)
+            except OSError as e:
+                print(f"Не удалось записать пульс: {str(e)}")
+            sleep(15)
+
+    def load_config(self):
+        """Загружает config.json"""
+        try:
+            if os.path.exists('config.json'):
+                with open('config.json', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Ошибка чтения config.json: {str(e)}")
+        return {}
+
+    def initialize_driver(self, headless=True):
+        """Инициализирует драйвер браузера из browser.name с обработкой ошибок"""
         try:
             if self.driver:
                 try:
@@ -155,63 +1361,15 @@ class MangaReader:
                 except Exception:
                     pass
             
-            browser_name = browser_name.lower().strip()
-            
-            if browser_name == "firefox":
-                firefox_options = FirefoxOptions()
-                firefox_options.add_argument("--headless")
-                firefox_options.add_argument("--disable-gpu")
-                firefox_options.add_argument("--no-sandbox")
-                firefox_options.add_argument("--disable-dev-shm-usage")
-                service = webdriver.FirefoxService(GeckoDriverManager().install())
-                self.driver = webdriver.Firefox(service=service, options=firefox_options)
-                
-            elif browser_name == "chrome":
-                chrome_options = ChromeOptions()
-                chrome_options.add_argument("--headless")
-                chrome_options.add_argument("--disable-gpu")
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-                service = webdriver.ChromeService(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                
-            elif browser_name == "opera":
-                opera_options = OperaOptions()
-                opera_options.add_argument("--headless")
-                opera_options.add_argument("--disable-gpu")
-                opera_options.add_argument("--no-sandbox")
-                opera_options.add_argument("--disable-dev-shm-usage")
-                service = webdriver.ChromeService(OperaDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=opera_options)
-                
-            elif browser_name == "yandex":
-                yandex_options = ChromeOptions()
-                yandex_options.add_argument("--headless")
-                yandex_options.add_argument("--disable-gpu")
-                yandex_options.add_argument("--no-sandbox")
-                yandex_options.add_argument("--disable-dev-shm-usage")
-                if os.name == 'nt':
-                    yandex_path = os.getenv('LOCALAPPDATA') + r'\Yandex\YandexBrowser\Application\browser.exe'
-                else:
-                    yandex_path = '/usr/bin/yandex-browser'
-                yandex_options.binary_location = yandex_path
-                service = webdriver.ChromeService(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=yandex_options)
-                
-            elif browser_name == "edge":
-                edge_options = ChromeOptions()
-                edge_options.add_argument("--headless")
-                edge_options.add_argument("--disable-gpu")
-                edge_options.add_argument("--no-sandbox")
-                edge_options.add_argument("--disable-dev-shm-usage")
-                service = webdriver.EdgeService(EdgeChromiumDriverManager().install())
-                self.driver = webdriver.Edge(service=service, options=edge_options)
-                
-            else:
-                raise ValueError(f"Unsupported browser: {browser_name}")
+            if self.browser_backend is None:
+                self.browser_backend = get_backend(self.config.get('browser', {}))
+                for capability in self.browser_backend.unsupported(headless):
+                    self.log_message(f"Браузер {self.browser_backend.name} не поддерживает {capability}, настройка пропущена")
             
+            self.driver = self.browser_backend.create_driver(headless=headless)
             self.driver.set_page_load_timeout(90)
-            self.wait = WebDriverWait(self.driver, 45)
+            self.driver.set_script_timeout(SCROLL_SCRIPT_TIMEOUT)
+            self.recycle_policy.reset()
             return True
             
         except Exception as e:
@@ -221,6 +1379,39 @@ class MangaReader:
                 self.telegram.send_message(error_msg)
             return False
 
+    def resolve_credentials(self):
+        """Учетные данные из окружения, файла с паролем или config.json; (None, None) - если их нет"""
+        credentials = self.config.get('credentials', {})
+        email = os.getenv('MANGAREAD_EMAIL') or credentials.get('email')
+        password = os.getenv('MANGAREAD_PASSWORD')
+        
+        password_file = os.getenv('MANGAREAD_PASSWORD_FILE') or credentials.get('password_file')
+        if not password and password_file:
+            try:
+                with open(password_file, encoding='utf-8') as f:
+                    password = f.read().strip()
+            except OSError as e:
+                self.log_message(f"Не удалось прочитать файл с паролем: {e}", is_error=True)
+        
+        password = password or credentials.get('password')
+        if email and password:
+            return email, password
+        return None, None
+
+    def resolve_reading_speed(self):
+        """Скорость чтения из окружения или config.json; None - если не задана или неверна"""
+        speed = os.getenv('MANGAREAD_SPEED') or self.config.get('reading_speed')
+        if speed is None:
+            return None
+        try:
+            speed = int(speed)
+        except (TypeError, ValueError):
+            speed = 0
+        if 1 <= speed <= 666:
+            return speed
+        self.log_message(f"Неверная скорость чтения в настройках: {speed} (допустимо 1-666)", is_error=True)
+        return None
+
     def get_credentials(self):
         """Запрашивает учетные данные у пользователя"""
         print("=== ВВОД ДАННЫХ ===")
@@ -232,6 +1423,7 @@ class MangaReader:
         
         if sys.platform == 'win32':
             # Для Windows
+            import msvcrt
             while True:
                 ch = msvcrt.getch()
                 if ch in (b'\r', b'\n'):
@@ -280,6 +1472,16 @@ class MangaReader:
                     self.current_volume = state.get("current_volume", 1)
                     self.current_chapter = state.get("current_chapter", 1)
                     self.processed_chapters = set(state.get("processed_chapters", []))
+                    self.favourite_titles = set(state.get("favourite_titles", []))
+                    self.report_cursor = state.get("report_cursor", 0)
+                    self.change_detector = ChapterChangeDetector(state.get("title_fingerprints"))
+                    self.pending_titles = deque(state.get("pending_titles", []))
+                    self.scheduler.restore(state.get("title_stats"))
+                    self.last_report_at = state.get("last_report_at", self.last_report_at)
+                    self.last_report_chapters = state.get("last_report_chapters", len(self.processed_chapters))
+                    for key, values in state.get("latency", {}).items():
+                        for value in values:
+                            self.latency.record(key, value)
                     return True
             except Exception as e:
                 self.log_message(f"Ошибка загрузки состояния: {e}", is_error=True)
@@ -292,11 +1494,21 @@ class MangaReader:
             "current_manga": self.current_manga,
             "current_volume": self.current_volume,
             "current_chapter": self.current_chapter,
-            "processed_chapters": list(self.processed_chapters)
+            "processed_chapters": list(self.processed_chapters),
+            "favourite_titles": sorted(self.favourite_titles),
+            "latency": self.latency.to_dict(),
+            "report_cursor": self.report_cursor,
+            "last_report_at": self.last_report_at,
+            "last_report_chapters": self.last_report_chapters,
+            "title_fingerprints": self.change_detector.snapshot(),
+            "pending_titles": self.get_pending_titles(),
+            "title_stats": self.scheduler.snapshot()
         }
         try:
-            with open(self.state_file, "w", encoding='utf-8') as f:
+            temp_file = f"{self.state_file}.tmp"
+            with open(temp_file, "w", encoding='utf-8') as f:
                 json.dump(state, f, indent=2)
+            os.replace(temp_file, self.state_file)
             return True
         except Exception as e:
             self.log_message(f"Ошибка сохранения состояния: {e}", is_error=True)
@@ -307,14 +1519,21 @@ class MangaReader:
         user_prefix = f"[USER:{self.user_identity.user_id[:8]}]"
         log_entry = f"{user_prefix}[{timestamp}] {message}\n"
         
-        with open("manga_bot_log.txt", "a", encoding='utf-8') as log_file:
+        with open(LOG_FILE, "a", encoding='utf-8') as log_file:
             log_file.write(log_entry)
         
+        if threading.current_thread() is threading.main_thread():
+            self.mark_progress()
+        
         print(f"{user_prefix} {message}")
         
         if is_error:
             self.last_error = message[:500]
             if hasattr(self, 'telegram') and self.telegram:
+                caller = sys._getframe(1)
+                if not self.error_digest.record(message, f"{caller.f_code.co_name}:{caller.f_lineno}"):
+                    self.metrics['errors_folded'] += 1
+                    return
                 try:
                     error_message = (
                         f"🚨 <b>MangaBot Error</b>\n"
@@ -329,34 +1548,192 @@ class MangaReader:
                 except Exception as e:
                     print(f"Не удалось отправить ошибку в Telegram: {str(e)}")
 
-    def safe_get(self, url, retries=3):
-        """Безопасная загрузка страницы с повторами"""
-        for attempt in range(retries):
+    def error_digest_loop(self):
+        """Фоновый поток: периодически отправляет сводку повторяющихся ошибок"""
+        while True:
+            sleep(self.digest_interval)
+            self.flush_error_digest()
+
+    def flush_error_digest(self):
+        """Отправляет в Telegram сводку повторов, накопленных с прошлой отправки"""
+        entries = self.error_digest.flush()
+        if not entries or not self.telegram:
+            return
+        
+        lines = ["🧾 <b>MangaBot: сводка повторяющихся ошибок</b>"]
+        for entry in entries[:20]:
+            first_seen = datetime.datetime.fromtimestamp(entry['first_seen']).strftime("%H:%M:%S")
+            last_seen = datetime.datetime.fromtimestamp(entry['last_seen']).strftime("%H:%M:%S")
+            lines.append(
+                f"• {entry['pending']}× <code>{html.escape(entry['text'])}</code>\n"
+                f"  {html.escape(entry['call_site'])}, впервые {first_seen}, последний раз {last_seen}"
+            )
+        if len(entries) > 20:
+            lines.append(f"… и еще {len(entries) - 20} видов ошибок")
+        
+        try:
+            self.telegram.send_message("\n".join(lines), disable_notification=True)
+        except Exception as e:
+            print(f"Не удалось отправить сводку ошибок: {str(e)}")
+
+    def safe_get(self, url, retries=None):
+        """Безопасная загрузка страницы с повторами по политике page_load"""
+        latency_key = f"page_load:{page_type(url)}"
+        
+        def load_page():
+            timeout = self.latency.timeout(latency_key, 90, self.page_load_ceiling)
             try:
+                _ = self.driver.current_url
+            except (WebDriverException, InvalidSessionIdException):
+                self.log_message("Соединение с браузером потеряно, перезапускаем...", is_error=True)
+                if not self.initialize_driver():
+                    raise
+            
+            # driver.get и ожидание readyState делят один таймаут; +5 с на сами команды WebDriver
+            with self.guarded("page_load", timeout + 5):
+                started = time.time()
                 try:
-                    _ = self.driver.current_url
-                except (WebDriverException, InvalidSessionIdException):
-                    self.log_message("Соединение с браузером потеряно, перезапускаем...", is_error=True)
-                    if not self.initialize_driver():
-                        raise
-                
-                self.driver.set_page_load_timeout(90)
-                self.driver.get(url)
-                self.wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
-                return True
-            except (TimeoutException, WebDriverException, InvalidSessionIdException) as e:
-                error_msg = f"Ошибка загрузки ({attempt+1}/{retries}): {str(e)[:100]}"
-                self.log_message(error_msg, is_error=True)
-                
-                if attempt == retries - 1:
-                    self.save_debug_info("page_load_failed")
+                    self.driver.set_page_load_timeout(timeout)
+                    self.driver.get(url)
+                    self.recycle_policy.record_navigation()
+                    self.metrics['navigations'] += 1
+                    WebDriverWait(self.driver, max(1, timeout - (time.time() - started))).until(
+                        lambda d: d.execute_script("return document.readyState") == "complete")
+                except TimeoutException:
+                    self.latency.record_timeout(latency_key, timeout, self.page_load_ceiling)
                     raise
-                
-                if "Tried to run command without establishing a connection" in str(e):
-                    if not self.initialize_driver():
-                        raise
-                
-                sleep(5 * (attempt + 1))
+                self.latency.record(latency_key, time.time() - started)
+            return True
+        
+        def on_error(error, attempt, attempts, will_retry):
+            self.metrics['page_load_errors'] += 1
+            self.log_message(f"Ошибка загрузки ({attempt}/{attempts}): {str(error)[:100]}", is_error=True)
+            if not will_retry:
+                self.save_debug_info("page_load_failed")
+            elif "Tried to run command without establishing a connection" in str(error):
+                self.initialize_driver()
+        
+        return self.retry_policies['page_load'].run(
+            load_page,
+            on_error=on_error,
+            should_stop=lambda: self.user_interrupt,
+            max_attempts=retries
+        )
+
+    def wait_for_site(self):
+        """Ждет, пока цепь 'site' разомкнута. False - если ожидание прервано"""
+        delay = self.site_breaker.retry_in()
+        if delay <= 0:
+            return True
+        self.scheduler.discard_unconfirmed()
+        self.log_message(f"Сайт недоступен, следующая попытка через {delay:.0f} с")
+        
+        def should_stop():
+            self.mark_progress()
+            return self.user_interrupt or self.switch_manga_flag
+        
+        return interruptible_sleep(delay, should_stop)
+
+    @contextmanager
+    def guarded(self, operation, timeout):
+        """Выполняет вызовы WebDriver под контролем сторожевого потока"""
+        try:
+            with self.watchdog.guard(operation, timeout):
+                yield
+        except Exception as e:
+            if not self.watchdog.consume_trip():
+                raise
+            self.recover_hung_driver(operation)
+            if isinstance(e, WebDriverException):
+                raise
+            raise WebDriverException(f"Операция '{operation}' прервана сторожевым таймером") from e
+        else:
+            if self.watchdog.consume_trip():
+                self.recover_hung_driver(operation)
+
+    def wait_until(self, condition, operation="wait"):
+        """Ожидание с таймаутом по наблюдаемой задержке операции, под контролем сторожевого потока.
+        Таймаут ожидания таймаут не увеличивает: элемента может просто не быть (недоступная глава,
+        нет кнопки); медленный сайт виден по загрузке страниц в safe_get"""
+        latency_key = f"wait:{operation}"
+        timeout = self.latency.timeout(latency_key, 45, self.wait_ceiling)
+        with self.guarded(operation, timeout):
+            started = time.time()
+            result = WebDriverWait(self.driver, timeout).until(condition)
+            self.latency.record(latency_key, time.time() - started)
+            return result
+
+    def probe(self, condition, operation, timeout=PROBE_TIMEOUT):
+        """Короткая проверка элемента, которого обычно нет: фиксированный таймаут, без выборок задержки.
+        Возвращает результат condition или None"""
+        with self.guarded(operation, timeout):
+            try:
+                return WebDriverWait(self.driver, timeout).until(condition)
+            except TimeoutException:
+                return None
+
+    def on_driver_hang(self, operation):
+        """Вызывается сторожевым потоком: завершает зависший браузер. Сообщение уходит из отдельного
+        потока, чтобы отправка в Telegram не задерживала проверку следующих дедлайнов"""
+        kill_browser_processes(self.driver)
+        self.metrics['watchdog_kills'] += 1
+        threading.Thread(target=self.report_driver_hang, args=(operation,), name="watchdog_alert", daemon=True).start()
+
+    def report_driver_hang(self, operation):
+        self.log_message(f"Операция '{operation}' превысила дедлайн, процессы браузера завершены", is_error=True)
+
+    def recover_hung_driver(self, operation):
+        """Перезапускает браузер после срабатывания сторожевого таймера"""
+        self.log_message(f"Перезапуск браузера после зависания операции '{operation}'")
+        self.save_state()
+        if self.initialize_driver():
+            self.restore_cookies(self.cookie_snapshot)
+
+    def recycle_driver(self, reason):
+        """Плановый перезапуск браузера с сохранением состояния и cookies"""
+        self.log_message(f"Плановый перезапуск браузера: {reason}")
+        self.save_state()
+        
+        cookies = self.cookie_snapshot
+        try:
+            with self.guarded("get_cookies", 30):
+                cookies = self.driver.get_cookies()
+            self.cookie_snapshot = cookies
+        except Exception as e:
+            self.log_message(f"Не удалось сохранить cookies: {str(e)[:100]}")
+        
+        if not self.initialize_driver():
+            return False
+        
+        self.metrics['browser_recycles'] += 1
+        self.restore_cookies(cookies)
+        return True
+
+    def restore_cookies(self, cookies):
+        """Переносит cookies в новую сессию браузера"""
+        if not cookies:
+            return
+        try:
+            self.safe_get("https://mangabuff.ru/")
+        except Exception as e:
+            self.log_message(f"Не удалось открыть сайт для восстановления cookies: {str(e)[:100]}", is_error=True)
+            return
+        
+        try:
+            with self.guarded("add_cookies", 30):
+                for cookie in cookies:
+                    try:
+                        self.driver.add_cookie(cookie)
+                    except WebDriverException:
+                        continue
+        except Exception as e:
+            self.log_message(f"Не удалось восстановить cookies: {str(e)[:100]}", is_error=True)
+
+    def maybe_recycle_driver(self):
+        """Проверяет политику замены браузера (вызывается только между главами)"""
+        reason = self.recycle_policy.check(browser_rss_mb(self.driver))
+        if reason:
+            return self.recycle_driver(reason)
         return False
 
     def check_login_state(self):
@@ -370,12 +1747,13 @@ class MangaReader:
         
         for check_name, locator in checks:
             try:
-                if callable(locator):
-                    result = locator()
-                else:
-                    result = self.driver.find_elements(By.CSS_SELECTOR, locator) if '.' in locator else \
-                            self.driver.find_elements(By.XPATH, locator)
-                    result = bool(result)
+                with self.guarded("check_login", 30):
+                    if callable(locator):
+                        result = locator()
+                    else:
+                        result = self.driver.find_elements(By.CSS_SELECTOR, locator) if '.' in locator else \
+                                self.driver.find_elements(By.XPATH, locator)
+                        result = bool(result)
                 
                 if result:
                     return True
@@ -395,14 +1773,8 @@ class MangaReader:
                 "3. Вернитесь сюда и нажмите Enter"
             )
         
-        try:
-            self.driver.quit()
-        except Exception:
-            pass
-        
-        firefox_options = FirefoxOptions()
-        service = webdriver.FirefoxService(GeckoDriverManager().install())
-        self.driver = webdriver.Firefox(service=service, options=firefox_options)
+        if not self.initialize_driver(headless=False):
+            return False
         
         try:
             self.driver.get("https://mangabuff.ru/login")
@@ -412,8 +1784,9 @@ class MangaReader:
                 self.log_message("Ручной вход подтвержден!")
                 if hasattr(self, 'telegram') and self.telegram:
                     self.telegram.send_message("✅ Ручной вход успешно выполнен!")
-                self.driver.quit()
-                self.initialize_driver()
+                self.cookie_snapshot = self.driver.get_cookies()
+                if self.initialize_driver():
+                    self.restore_cookies(self.cookie_snapshot)
                 return True
                 
             self.log_message("Не удалось подтвердить вход", is_error=True)
@@ -443,6 +1816,7 @@ class MangaReader:
     def login(self, email, password):
         """Выполняет вход на сайт"""
         self.login_attempts += 1
+        self.login_rejected = False
         self.email = email
         self.password = password
         
@@ -458,53 +1832,63 @@ class MangaReader:
                 return False
             
             try:
-                email_field = self.wait.until(
-                    EC.presence_of_element_located((By.NAME, "email"))
+                email_field = self.wait_until(
+                    EC.presence_of_element_located((By.NAME, "email")), "login_email"
                 )
-                pass_field = self.wait.until(
-                    EC.presence_of_element_located((By.NAME, "password"))
+                pass_field = self.wait_until(
+                    EC.presence_of_element_located((By.NAME, "password")), "login_password"
                 )
             except TimeoutException:
                 self.log_message("Не удалось найти поля ввода на странице", is_error=True)
                 self.save_debug_info("login_fields_missing")
                 return False
             
-            email_field.clear()
-            email_field.send_keys(email)
-            
-            pass_field.clear()
-            pass_field.send_keys(password)
+            with self.guarded("login_form", 30):
+                email_field.clear()
+                email_field.send_keys(email)
+                
+                pass_field.clear()
+                pass_field.send_keys(password)
             
             try:
-                login_btn = self.wait.until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Войти')]"))
+                login_btn = self.wait_until(
+                    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Войти')]")), "login_button"
                 )
-                login_btn.click()
+                with self.guarded("login_click", 30):
+                    login_btn.click()
             except Exception as e:
                 self.log_message(f"Ошибка при нажатии кнопки входа: {str(e)}", is_error=True)
                 self.save_debug_info("login_button_error")
                 return False
             
-            try:
-                error_msg = self.wait.until(
-                    EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Неверный email или пароль')]"))
-                )
-                if error_msg:
-                    self.log_message("Ошибка: Неверный email или пароль", is_error=True)
-                    if hasattr(self, 'telegram') and self.telegram:
-                        self.telegram.send_message("❌ Неверный email или пароль!")
-                    return False
-            except TimeoutException:
-                if self.check_login_state():
-                    self.log_message("Вход выполнен успешно!")
-                    self.is_logged_in = True
-                    if hasattr(self, 'telegram') and self.telegram:
-                        self.telegram.send_message("✅ Вход выполнен успешно!")
-                    return True
-                
-                self.log_message("Не удалось определить результат входа", is_error=True)
-                self.save_debug_info("login_ambiguous")
+            error_msg = self.probe(
+                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'Неверный email или пароль')]")),
+                "login_error"
+            )
+            if error_msg:
+                self.login_rejected = True
+                self.log_message("Ошибка: Неверный email или пароль", is_error=True)
+                if hasattr(self, 'telegram') and self.telegram:
+                    self.telegram.send_message("❌ Неверный email или пароль!")
                 return False
+            
+            if self.check_login_state():
+                self.log_message("Вход выполнен успешно!")
+                self.is_logged_in = True
+                try:
+                    with self.guarded("get_cookies", 30):
+                        self.cookie_snapshot = self.driver.get_cookies()
+                        user_agent = self.driver.execute_script("return navigator.userAgent")
+                    self.change_detector.use_browser_session(self.cookie_snapshot, user_agent)
+                except Exception as e:
+                    self.log_message(f"Не удалось сохранить cookies: {str(e)[:100]}")
+                if hasattr(self, 'telegram') and self.telegram:
+                    self.telegram.send_message("✅ Вход выполнен успешно!")
+                return True
+            
+            self.log_message("Не удалось определить результат входа", is_error=True)
+            self.save_debug_info("login_ambiguous")
+            return False
                 
         except Exception as e:
             self.log_message(f"Критическая ошибка при входе: {str(e)}", is_error=True)
@@ -520,24 +1904,25 @@ class MangaReader:
                 return None
             
             try:
-                manga_cards = self.wait.until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.cards__item"))
+                manga_cards = self.wait_until(
+                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.cards__item")), "catalog_cards"
                 )
             except TimeoutException:
                 self.log_message("Карточки манги не найдены на странице", is_error=True)
                 return None
             
             manga_list = []
-            for card in manga_cards:
-                try:
-                    href = card.get_attribute("href")
-                    if href and '/manga/' in href:
-                        manga_slug = href.split('/')[-1]
-                        if manga_slug and manga_slug != 'manga':
-                            manga_list.append(manga_slug)
-                except Exception as e:
-                    self.log_message(f"Ошибка извлечения ссылки: {str(e)[:100]}", is_error=True)
-                    continue
+            with self.guarded("catalog_links", 60):
+                for card in manga_cards:
+                    try:
+                        href = card.get_attribute("href")
+                        if href and '/manga/' in href:
+                            manga_slug = href.split('/')[-1]
+                            if manga_slug and manga_slug != 'manga':
+                                manga_list.append(manga_slug)
+                    except WebDriverException as e:
+                        self.log_message(f"Ошибка извлечения ссылки: {str(e)[:100]}", is_error=True)
+                        continue
             
             return manga_list if manga_list else None
             
@@ -546,7 +1931,7 @@ class MangaReader:
             return None
 
     def get_chapters(self, manga_slug):
-        """Получает список глав для указанной манги"""
+        """Получает список глав для указанной манги; None - если список не удалось разобрать"""
         try:
             url = f"https://mangabuff.ru/manga/{manga_slug}"
             if not self.safe_get(url):
@@ -557,37 +1942,51 @@ class MangaReader:
             
             try:
                 chapters = []
-                chapter_elements = self.wait.until(
+                chapter_elements = self.wait_until(
                     EC.presence_of_all_elements_located(
                         (By.CSS_SELECTOR, "a.chapter-item, a.chapter-link, [href*='/manga/']")
-                    )
+                    ),
+                    "chapter_list"
                 )
                 
-                for elem in chapter_elements:
-                    try:
-                        href = elem.get_attribute("href")
-                        if href and '/manga/' in href:
-                            parts = href.split('/')
-                            if len(parts) >= 5:
-                                volume = int(parts[-2])
-                                chapter = int(parts[-1])
-                                chapters.append((volume, chapter))
-                    except Exception:
-                        continue
+                with self.guarded("chapter_links", 120):
+                    for elem in chapter_elements:
+                        try:
+                            href = elem.get_attribute("href")
+                            if href and '/manga/' in href:
+                                parts = href.split('/')
+                                if len(parts) >= 5:
+                                    volume = int(parts[-2])
+                                    chapter = int(parts[-1])
+                                    chapters.append((volume, chapter))
+                        except (ValueError, WebDriverException):
+                            continue
                 
                 chapters = sorted(list(set(chapters)), key=lambda x: (x[0], x[1]))
                 
                 if not chapters:
-                    self.log_message("Главы не найдены, используем том 1 главу 1")
-                    return [(1, 1)]
+                    self.log_message(f"Главы не найдены на странице манги {manga_slug}")
+                    self.record_title_load(manga_slug, False)
+                    return None
                 
+                self.record_title_load(manga_slug, True)
                 return chapters
                 
             except Exception as e:
                 self.log_message(f"Ошибка поиска глав: {str(e)[:100]}", is_error=True)
-                return [(1, 1)]
-        except Exception:
-            return [(1, 1)]
+                self.record_title_load(manga_slug, False)
+                return None
+        except Exception as e:
+            self.log_message(f"Не удалось загрузить страницу манги {manga_slug}: {str(e)[:100]}", is_error=True)
+            self.record_title_load(manga_slug, False)
+            return None
+
+    def record_title_load(self, manga_slug, success):
+        """Передает планировщику результат загрузки; ошибки при разомкнутой цепи 'site' - сбой сайта, а не тайтла"""
+        if not success and self.site_breaker.retry_in() > 0:
+            self.scheduler.discard_unconfirmed()
+            return
+        self.scheduler.record_load(manga_slug, success)
 
     def read_chapter(self, manga_slug, volume, chapter):
         """Читает указанную главу манги с полной загрузкой страницы"""
@@ -597,6 +1996,7 @@ class MangaReader:
             self.log_message(f"Глава том {volume} глава {chapter} уже в списке обработанных")
             return None
         
+        self.log_message(f"Открываем главу: {manga_slug} том {volume} глава {chapter}")
         try:
             url = f"https://mangabuff.ru/manga/{manga_slug}/{volume}/{chapter}"
             if not self.safe_get(url):
@@ -605,12 +2005,14 @@ class MangaReader:
             
             # Улучшенная проверка загрузки контента
             try:
-                self.wait.until(EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, ".reader-container, .reader, .manga-reader, .chapter-content, img")))
+                self.wait_until(EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, READER_SELECTOR)),
+                    "reader")
             except TimeoutException:
                 try:
-                    error_msg = self.driver.find_element(By.XPATH, 
-                        "//*[contains(text(), 'недоступна') or contains(text(), 'удалена')]")
+                    with self.guarded("find_element", 30):
+                        error_msg = self.driver.find_element(By.XPATH, 
+                            "//*[contains(text(), 'недоступна') or contains(text(), 'удалена')]")
                     if error_msg:
                         self.log_message(f"Глава недоступна или удалена: том {volume} глава {chapter}", is_error=True)
                         self.processed_chapters.add(chapter_key)
@@ -618,69 +2020,29 @@ class MangaReader:
                 except NoSuchElementException:
                     self.log_message("Контент главы загружен не полностью, но продолжаем обработку")
             
-            # Добавляем в избранное (если еще не добавлено)
-            try:
-                favorite_btn = self.wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 
-                        ".favourite-btn, .favorite-btn, [class*='favourite-btn'], [class*='favorite-btn']")))
-                
-                btn_classes = favorite_btn.get_attribute("class")
-                is_active = "active" in btn_classes or "favourite-btn--active" in btn_classes
-                
-                if not is_active:
-                    try:
-                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", favorite_btn)
-                        sleep(1)
-                        
-                        favorite_btn.click()
-                        sleep(2)
-                        
-                        btn_classes = favorite_btn.get_attribute("class")
-                        is_active_now = "active" in btn_classes or "favourite-btn--active" in btn_classes
-                        
-                        if not is_active_now:
-                            self.log_message("Кнопка избранного не изменила состояние после нажатия!")
-                            favorite_btn.click()
-                            sleep(2)
-                    except Exception as e:
-                        self.log_message(f"Не удалось нажать кнопку избранного: {str(e)[:100]}", is_error=True)
-                        return None
-            except Exception as e:
-                self.log_message(f"Ошибка при работе с избранным: {str(e)[:100]}", is_error=True)
-                return None
+            # Добавляем в избранное (один раз на тайтл)
+            self.ensure_favourite(manga_slug)
 
-            # Прокрутка всей страницы для имитации чтения
+            # Прокрутка всей страницы для имитации чтения (несколько вызовов WebDriver)
             try:
-                total_height = int(self.driver.execute_script("return document.body.scrollHeight"))
-                viewport_height = int(self.driver.execute_script("return window.innerHeight"))
-                
-                scroll_steps = random.randint(10, 20)
-                step_size = total_height // scroll_steps
-                
-                for i in range(1, scroll_steps + 1):
-                    if self.user_interrupt or self.switch_manga_flag:
-                        return None
-                        
-                    scroll_pos = min(i * step_size, total_height - viewport_height)
-                    self.driver.execute_script(f"window.scrollTo(0, {scroll_pos});")
-                    sleep(random.uniform(0.5, 2.0))
-                    
-                    if random.random() < 0.3:
-                        try:
-                            body = self.driver.find_element(By.TAG_NAME, 'body')
-                            ActionChains(self.driver).move_to_element(body).click().perform()
-                        except Exception:
-                            pass
-                
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-                sleep(3)
-                
+                result = self.run_scroll_pass(self.plan_scroll_pass())
             except Exception as e:
                 self.log_message(f"Ошибка при прокрутке страницы: {str(e)[:100]}", is_error=True)
                 return None
             
+            if result is None:
+                return None
+            
+            loaded, expected = result.get("loaded", 0), result.get("expected", 0)
+            if loaded < expected:
+                self.metrics['chapters_incomplete'] += 1
+                self.log_message(f"Загружены не все страницы главы: {loaded}/{expected}")
+            elif not expected:
+                self.log_message("Изображения ридера не найдены на странице главы")
+            
             self.processed_chapters.add(chapter_key)
-            self.log_message(f'Глава том {volume} глава {chapter} успешно обработана')
+            self.log_message(f'Глава том {volume} глава {chapter} успешно обработана '
+                             f'(страниц {loaded}/{expected}, {result.get("elapsed_ms", 0) / 1000:.1f} с)')
             
             chapters = self.get_chapters(manga_slug)
             if chapters:
@@ -701,12 +2063,138 @@ class MangaReader:
             
             return None
 
+    def plan_scroll_pass(self):
+        """Случайный план прокрутки главы для SCROLL_PASS_SCRIPT"""
+        scroll_steps = random.randint(10, 20)
+        return {
+            "steps": [
+                {
+                    "fraction": i / scroll_steps,
+                    "pause_ms": int(random.uniform(0.5, 2.0) * 1000),
+                    "click": random.random() < 0.3
+                }
+                for i in range(1, scroll_steps + 1)
+            ],
+            "image_selector": READER_IMAGE_SELECTOR,
+            "image_wait_ms": 10000,
+            "final_wait_ms": 15000,
+            "deadline_ms": (SCROLL_SCRIPT_TIMEOUT - 10) * 1000
+        }
+
+    def run_scroll_pass(self, plan):
+        """Выполняет план частями по SCROLL_CHUNK_STEPS шагов; None - если пользователь прервал чтение"""
+        steps = plan["steps"]
+        result = {}
+        for start in range(0, len(steps), SCROLL_CHUNK_STEPS):
+            if self.user_interrupt or self.switch_manga_flag:
+                return None
+            chunk = dict(plan, steps=steps[start:start + SCROLL_CHUNK_STEPS],
+                         first=start == 0, last=start + SCROLL_CHUNK_STEPS >= len(steps))
+            with self.guarded("scroll_pass", SCROLL_SCRIPT_TIMEOUT):
+                result = self.driver.execute_async_script(SCROLL_PASS_SCRIPT, chunk) or {}
+            self.mark_progress()
+            if result.get("finished"):
+                break
+        if self.user_interrupt or self.switch_manga_flag:
+            return None
+        return result
+
+    def check_new_chapters(self, manga_slug):
+        """Новый список глав, если он изменился (HTTP, при ошибке - через браузер), иначе None"""
+        try:
+            return self.change_detector.check(manga_slug)
+        except Exception as e:
+            self.log_message(f"HTTP-проверка глав {manga_slug} не удалась, проверяем через браузер: {str(e)[:100]}")
+        
+        chapters = self.get_chapters(manga_slug)
+        if not chapters or self.change_detector.known_count(manga_slug) == len(chapters):
+            return None
+        self.change_detector.remember(manga_slug, chapters)
+        return chapters
+
+    def get_pending_titles(self):
+        with self.watch_lock:
+            return list(self.pending_titles)
+
+    def title_watch_loop(self):
+        """Фоновый поток: периодически проверяет отслеживаемые тайтлы на новые главы по HTTP"""
+        while not self.user_interrupt:
+            if not interruptible_sleep(self.watch_interval, lambda: self.user_interrupt):
+                return
+            if self.site_breaker.retry_in() > 0:
+                continue
+            
+            for manga_slug in sorted(self.favourite_titles | set(self.change_detector.snapshot())):
+                if self.user_interrupt:
+                    return
+                if manga_slug == self.current_manga or manga_slug in self.get_pending_titles():
+                    continue
+                
+                known = self.change_detector.known_count(manga_slug)
+                try:
+                    chapters = self.change_detector.check(manga_slug)
+                except Exception as e:
+                    self.log_message(f"Не удалось проверить новые главы {manga_slug}: {str(e)[:100]}")
+                    continue
+                
+                if chapters and len(chapters) > known:
+                    with self.watch_lock:
+                        self.pending_titles.append(manga_slug)
+                    self.log_message(f"Вышли новые главы {manga_slug} ({known} -> {len(chapters)}), тайтл поставлен в очередь")
+                    if hasattr(self, 'telegram') and self.telegram:
+                        self.telegram.send_message(f"🆕 Обнаружены новые главы для <b>{manga_slug}</b>!")
+                sleep(2)
+
+    def ensure_favourite(self, manga_slug):
+        """Добавляет мангу в избранное; кнопка проверяется один раз на тайтл"""
+        if manga_slug in self.favourite_titles or manga_slug in self.favourite_checked:
+            return
+        self.favourite_checked.add(manga_slug)
+        
+        try:
+            favorite_btn = self.wait_until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 
+                    ".favourite-btn, .favorite-btn, [class*='favourite-btn'], [class*='favorite-btn']")),
+                "favourite_button")
+            
+            with self.guarded("favourite_state", 30):
+                btn_classes = favorite_btn.get_attribute("class")
+            is_active = "active" in btn_classes or "favourite-btn--active" in btn_classes
+            
+            if not is_active:
+                with self.guarded("favourite_click", 30):
+                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", favorite_btn)
+                    sleep(1)
+                    
+                    favorite_btn.click()
+                    sleep(2)
+                    
+                    btn_classes = favorite_btn.get_attribute("class")
+                    is_active = "active" in btn_classes or "favourite-btn--active" in btn_classes
+                    
+                    if not is_active:
+                        self.log_message("Кнопка избранного не изменила состояние после нажатия!")
+                        favorite_btn.click()
+                        sleep(2)
+                        btn_classes = favorite_btn.get_attribute("class")
+                        is_active = "active" in btn_classes or "favourite-btn--active" in btn_classes
+            
+            if is_active:
+                self.favourite_titles.add(manga_slug)
+                self.save_state()
+        except TimeoutException:
+            self.log_message(f"Кнопка избранного не найдена для {manga_slug}, продолжаем без нее")
+        except Exception as e:
+            self.log_message(f"Ошибка при работе с избранным: {str(e)[:100]}", is_error=True)
+
     def process_manga(self, manga_slug):
         """Обрабатывает всю мангу до конца"""
         self.log_message(f"Начинаем чтение манги: {manga_slug}")
         
         chapters = self.get_chapters(manga_slug)
         total_chapters = len(chapters) if chapters else 0
+        if chapters:
+            self.change_detector.remember(manga_slug, chapters)
         
         if hasattr(self, 'telegram') and self.telegram:
             try:
@@ -731,6 +2219,7 @@ class MangaReader:
                     if not chapters:
                         self.log_message("Не удалось получить список глав", is_error=True)
                         return False
+                    self.change_detector.remember(manga_slug, chapters)
                 
                 current_pos = (self.current_volume, self.current_chapter)
                 if current_pos not in chapters:
@@ -749,17 +2238,29 @@ class MangaReader:
                     if chapter_key in self.processed_chapters:
                         continue
                     
+                    if not self.wait_for_site():
+                        self.switch_manga_flag = False
+                        return False
+                    
                     self.current_volume, self.current_chapter = next_vol, next_ch
                     self.save_state()
                     
-                    result = self.read_chapter(manga_slug, next_vol, next_ch)
-                    if result is not None:
+                    self.read_chapter(manga_slug, next_vol, next_ch)
+                    # read_chapter возвращает None и после последней главы, поэтому успех - по processed_chapters
+                    if chapter_key in self.processed_chapters:
+                        self.record_title_load(manga_slug, True)
                         read_count += 1
+                    elif not (self.user_interrupt or self.switch_manga_flag):
+                        self.record_title_load(manga_slug, False)
+                    
+                    self.maybe_recycle_driver()
+                    self.maybe_send_status_report()
                     
                     if i < len(chapters) - 1:
                         delay = self.calculate_delay(self.reading_speed)
                         start_time = time.time()
                         while time.time() - start_time < delay:
+                            self.mark_progress()
                             if self.user_interrupt or self.switch_manga_flag:
                                 self.log_message("Прерывание ожидания по запросу пользователя")
                                 self.switch_manga_flag = False
@@ -767,7 +2268,7 @@ class MangaReader:
                             sleep(1)
             
                 try:
-                    updated_chapters = self.get_chapters(manga_slug)
+                    updated_chapters = self.check_new_chapters(manga_slug)
                     if updated_chapters and len(updated_chapters) > len(chapters):
                         self.log_message(f"Обнаружены новые главы ({len(chapters)} -> {len(updated_chapters)})")
                         if hasattr(self, 'telegram') and self.telegram:
@@ -799,42 +2300,106 @@ class MangaReader:
                 self.log_message(f"Ошибка отправки сообщения в Telegram: {str(e)}", is_error=True)
         return True
 
+    def toggle_profiler(self):
+        """Включает или выключает профилировщик стеков (клавиша P или SIGUSR1)"""
+        if self.profiler.toggle():
+            self.log_message(f"Профилировщик включен, стеки пишутся в {self.profiler.directory}")
+        else:
+            self.log_message("Профилировщик выключен")
+
     def keyboard_listener(self):
         """Слушает нажатия клавиш для управления ботом"""
         print("\nУправление ботом:")
         print("U - Переключиться на другую мангу")
+        print("P - Включить/выключить профилировщик")
         print("Q - Завершить работу\n")
         
+        if sys.platform == 'win32':
+            import msvcrt
+            
+            def read_key():
+                while not msvcrt.kbhit():
+                    if self.user_interrupt:
+                        return None
+                    sleep(0.1)
+                return msvcrt.getch().decode('utf-8', errors='ignore').lower()
+        elif sys.stdin.isatty():
+            import atexit
+            import select
+            import termios
+            import tty
+            
+            # Посимвольный ввод без Enter; настройки терминала восстанавливаются при выходе
+            fd = sys.stdin.fileno()
+            atexit.register(termios.tcsetattr, fd, termios.TCSADRAIN, termios.tcgetattr(fd))
+            tty.setcbreak(fd)
+            
+            def read_key():
+                while not select.select([fd], [], [], 0.1)[0]:
+                    if self.user_interrupt:
+                        return None
+                return os.read(fd, 1).decode('utf-8', errors='ignore').lower()
+        else:
+            # stdin не терминал (перенаправлен из файла или канала): команды по строкам
+            def read_key():
+                line = sys.stdin.readline()
+                return line.strip().lower()[:1] if line else None
+        
         while not self.user_interrupt:
-            if msvcrt.kbhit():
-                key = msvcrt.getch().decode('utf-8').lower()
-                if key == 'q':
-                    self.user_interrupt = True
-                    self.log_message("Получена команда на завершение работы")
-                    if hasattr(self, 'telegram') and self.telegram:
-                        self.telegram.send_message("🛑 Получена команда на завершение работы")
-                elif key == 'u':
-                    self.switch_manga_flag = True
-                    self.log_message("Получена команда на переключение манги")
-                    if hasattr(self, 'telegram') and self.telegram:
-                        self.telegram.send_message("🔄 Получена команда на переключение манги")
+            key = read_key()
+            if key is None:
+                return
+            if key == 'q':
+                self.user_interrupt = True
+                self.log_message("Получена команда на завершение работы")
+                if hasattr(self, 'telegram') and self.telegram:
+                    self.telegram.send_message("🛑 Получена команда на завершение работы")
+            elif key == 'p':
+                self.toggle_profiler()
+            elif key == 'u':
+                self.switch_manga_flag = True
+                self.log_message("Получена команда на переключение манги")
+                if hasattr(self, 'telegram') and self.telegram:
+                    self.telegram.send_message("🔄 Получена команда на переключение манги")
 
     def main_loop(self):
         """Основной цикл работы бота"""
         max_page_attempts = 3
         page_attempts = 0
+        error_delay = None
+        loop_policy = self.retry_policies['main_loop']
+        
+        if not self.non_interactive:
+            keyboard_thread = threading.Thread(target=self.keyboard_listener, name="keyboard_listener", daemon=True)
+            keyboard_thread.start()
         
-        keyboard_thread = threading.Thread(target=self.keyboard_listener, daemon=True)
-        keyboard_thread.start()
+        if self.watch_interval:
+            threading.Thread(target=self.title_watch_loop, name="title_watch", daemon=True).start()
         
         while not self.user_interrupt:
             try:
+                if not self.wait_for_site():
+                    self.switch_manga_flag = False
+                    continue
+                
                 if self.current_manga:
                     self.process_manga(self.current_manga)
                     self.current_manga = None
                     self.save_state()
                     continue
                 
+                self.maybe_recycle_driver()
+                
+                with self.watch_lock:
+                    pending_title = self.pending_titles.popleft() if self.pending_titles else None
+                if pending_title:
+                    self.log_message(f"Переходим к тайтлу с новыми главами: {pending_title}")
+                    self.current_manga = pending_title
+                    self.current_volume = 1
+                    self.current_chapter = 1
+                    self.save_state()
+                    continue
+                
                 manga_list = self.get_manga_from_catalog(self.current_page)
                 
                 if not manga_list:
@@ -856,48 +2421,106 @@ class MangaReader:
                 
                 page_attempts = 0
                 
-                self.current_manga = random.choice(manga_list)
+                self.current_manga = self.scheduler.choose(
+                    manga_list, self.processed_chapters, self.change_detector.known_count)
+                self.log_message(f"Выбран тайтл {self.current_manga} (политика {self.scheduler.policy})")
                 self.current_volume = 1
                 self.current_chapter = 1
                 self.save_state()
                 
-                if len(self.processed_chapters) % 10 == 0:
-                    self.send_status_report()
+                self.maybe_send_status_report()
+                
+                error_delay = None
                 
             except Exception as e:
                 self.log_message(f'Ошибка в основном цикле: {str(e)[:100]}', is_error=True)
+                if isinstance(e, CircuitOpenError):
+                    continue
                 self.save_debug_info("main_loop_error")
-                sleep(10)
+                error_delay = loop_policy.next_delay(error_delay)
+                interruptible_sleep(error_delay, lambda: self.user_interrupt)
                 self.initialize_driver()
 
+    def maybe_send_status_report(self):
+        """Отправляет отчет, если прошел интервал или набралось нужное число глав"""
+        chapters_read = len(self.processed_chapters) - self.last_report_chapters
+        interval_passed = self.report_interval and time.time() - self.last_report_at >= self.report_interval
+        chapters_passed = self.report_every_chapters and chapters_read >= self.report_every_chapters
+        if interval_passed or chapters_passed:
+            self.send_status_report()
+
     def send_status_report(self):
-        """Отправляет отчет о статусе"""
+        """Отправляет отчет о статусе в фоновом потоке: текст, скриншот и сжатый прирост лога"""
         if not hasattr(self, 'telegram') or not self.telegram:
             return
+        if self.report_thread and self.report_thread.is_alive():
+            return
+        
+        self.last_report_at = time.time()
+        self.last_report_chapters = len(self.processed_chapters)
             
         status = (
             f"📊 <b>MangaBot Status Report</b>\n"
             f"• Текущая манга: {self.current_manga or 'Нет'}\n"
             f"• Том/Глава: {self.current_volume}/{self.current_chapter}\n"
             f"• Прочитано глав: {len(self.processed_chapters)}\n"
+            f"• Перезапусков браузера: {self.metrics['browser_recycles']}\n"
+            f"• Зависаний браузера (watchdog): {self.metrics['watchdog_kills']}\n"
+            f"• Переходов по страницам: {self.metrics['navigations']}, ошибок загрузки: {self.metrics['page_load_errors']}\n"
+            f"• Глав с незагруженными страницами: {self.metrics['chapters_incomplete']}\n"
+            f"• Повторов ошибок, свернутых в сводку: {self.metrics['errors_folded']}\n"
             f"• Последняя ошибка: {self.last_error or 'Нет'}"
         )
         
+        screenshot = None
+        try:
+            with self.guarded("save_screenshot", 30):
+                screenshot = self.driver.get_screenshot_as_png()
+        except Exception as e:
+            print(f"Не удалось сделать скриншот для отчета: {str(e)}")
+        
+        self.report_thread = threading.Thread(
+            target=self._deliver_status_report,
+            args=(status, screenshot),
+            name="status_report",
+            daemon=True
+        )
+        self.report_thread.start()
+
+    def _deliver_status_report(self, status, screenshot):
+        """Фоновая отправка отчета; курсор лога сдвигается только после успешной отправки"""
         try:
             self.telegram.send_message(status)
             
-            screenshot_path = "debug/current_status.png"
-            self.driver.save_screenshot(screenshot_path)
-            self.telegram.send_photo(
-                screenshot_path,
-                caption="Текущее состояние браузера"
-            )
-            
-            if os.path.exists("manga_bot_log.txt"):
-                self.telegram.send_document(
-                    "manga_bot_log.txt",
-                    caption="Полный лог работы бота"
+            if screenshot:
+                self.telegram.send_photo(
+                    screenshot,
+                    caption="Текущее состояние браузера"
                 )
+            
+            if not os.path.exists(LOG_FILE):
+                return
+            
+            start = self.report_cursor
+            end = os.path.getsize(LOG_FILE)
+            if end < start:
+                start = 0
+            if end - start > MAX_LOG_DELTA_BYTES:
+                start = end - MAX_LOG_DELTA_BYTES
+            if end == start:
+                return
+            
+            with open(LOG_FILE, "rb") as f:
+                f.seek(start)
+                delta = f.read(end - start)
+            
+            result = self.telegram.send_document(
+                gzip.compress(delta),
+                caption=f"Лог работы бота: байты {start}-{end}",
+                filename=f"manga_bot_log_{start}-{end}.txt.gz"
+            )
+            if result:
+                self.report_cursor = end
         except Exception as e:
             print(f"Ошибка отправки отчета: {str(e)}")
 
@@ -908,15 +2531,16 @@ class MangaReader:
             timestamp = int(time.time())
             
             screenshot_path = f"debug/{prefix}debug_{timestamp}.png"
-            self.driver.save_screenshot(screenshot_path)
-            
             page_source_path = f"debug/{prefix}page_source_{timestamp}.html"
-            with open(page_source_path, "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
-                
             cookies_path = f"debug/{prefix}cookies_{timestamp}.json"
-            with open(cookies_path, "w") as f:
-                json.dump(self.driver.get_cookies(), f)
+            with self.guarded("save_debug_info", 60):
+                self.driver.save_screenshot(screenshot_path)
+                
+                with open(page_source_path, "w", encoding="utf-8") as f:
+                    f.write(self.driver.page_source)
+                    
+                with open(cookies_path, "w") as f:
+                    json.dump(self.driver.get_cookies(), f)
                 
             self.log_message(f"Сохранена отладочная информация: {screenshot_path}")
             
@@ -937,7 +2561,7 @@ class MangaReader:
             return False
 
     def run(self):
-        """Запуск программы"""
+        """Запуск программы. Возвращает код завершения: 0 - штатная остановка, 1 - сбой, EXIT_FATAL - ошибка настройки"""
         try:
             self.log_message(f"Запуск бота для пользователя: {self.user_identity.username}@{self.user_identity.hostname}")
             self.log_message(f"Уникальный ID пользователя: {self.user_identity.user_id}")
@@ -947,30 +2571,59 @@ class MangaReader:
                 if hasattr(self, 'telegram') and self.telegram:
                     self.telegram.send_message("⚙ Загружено сохраненное состояние бота")
             
-            email, password = self.get_credentials()
+            try:
+                get_backend(self.config.get('browser', {}))
+            except ValueError as e:
+                self.log_message(f"Ошибка настройки браузера: {e}", is_error=True)
+                return EXIT_FATAL
+            
+            if not self.driver and not self.initialize_driver():
+                self.log_message("Браузер не запущен, завершение работы", is_error=True)
+                return 1
             
-            while self.login_attempts < self.max_login_attempts and not self.user_interrupt:
-                if self.login(email, password):
-                    break
-                
-                if self.login_attempts >= self.max_login_attempts:
-                    self.log_message("Достигнуто максимальное количество попыток входа", is_error=True)
-                    return
+            email, password = self.resolve_credentials()
+            if not email:
+                if self.non_interactive:
+                    self.log_message("Нет учетных данных для неинтерактивного запуска "
+                                     "(MANGAREAD_EMAIL/MANGAREAD_PASSWORD или credentials в config.json)", is_error=True)
+                    return EXIT_FATAL
+                email, password = self.get_credentials()
+            
+            def attempt_login():
+                if not self.login(email, password):
+                    raise LoginError("Вход не выполнен", rejected=self.login_rejected)
+                return True
+            
+            try:
+                self.retry_policies['login'].run(attempt_login, should_stop=lambda: self.user_interrupt)
+            except LoginError as e:
+                if e.rejected:
+                    self.log_message("Учетные данные отклонены сайтом, повторный вход не имеет смысла", is_error=True)
+                    return EXIT_FATAL
+                if self.user_interrupt:
+                    return 0
+                self.log_message("Достигнуто максимальное количество попыток входа", is_error=True)
+                return 1
             
             if not self.check_login_state():
                 self.log_message("Не удалось авторизоваться. Завершение работы.", is_error=True)
-                return
+                return 1
             
-            self.reading_speed = self.get_reading_speed()
+            speed = self.resolve_reading_speed()
+            if speed is None and not self.non_interactive:
+                speed = self.get_reading_speed()
+            self.reading_speed = speed or self.reading_speed
             self.log_message(f"Установлена скорость: {self.reading_speed} глав/час")
             
             self.main_loop()
+            return 0
 
         except KeyboardInterrupt:
             self.log_message("\nОстановлено пользователем")
             if hasattr(self, 'telegram') and self.telegram:
                 self.telegram.send_message("⏸ Работа бота приостановлена пользователем")
             self.save_state()
+            return 0
         except Exception as e:
             self.log_message(f'Критическая ошибка: {e}', is_error=True)
             self.save_state()
@@ -984,9 +2637,12 @@ class MangaReader:
                     f"🔄 Попытка восстановления..."
                 )
                 self.telegram.send_message(error_msg)
+            return 1
         finally:
             try:
                 self.user_interrupt = True
+                self.flush_error_digest()
+                self.profiler.stop()
                 if self.driver:
                     self.driver.quit()
                 self.log_message("Браузер закрыт")
@@ -996,16 +2652,43 @@ class MangaReader:
                 self.log_message(f"Ошибка при закрытии: {e}", is_error=True)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MangaBuff reader bot")
+    parser.add_argument("--non-interactive", action="store_true",
+                        help="не задавать вопросов: учетные данные и скорость берутся из окружения/config.json")
+    parser.add_argument("--supervise", action="store_true",
+                        help="запустить бота под супервизором с автоматическим перезапуском")
+    args = parser.parse_args()
+    
     if not os.path.exists("config.json"):
         config = {
             "telegram": {
                 "token": "ВАШ_TELEGRAM_BOT_TOKEN",
                 "chat_id": "ВАШ_CHAT_ID"
+            },
+            "browser": {
+                "name": "firefox",
+                "block_resources": False,
+                "recycle": {
+                    "max_rss_mb": 1500,
+                    "max_navigations": 400,
+                    "max_age_minutes": 180
+                }
             }
         }
         with open("config.json", "w") as f:
             json.dump(config, f, indent=4)
         print("Создан файл config.json. Заполните его данными вашего Telegram бота.")
+    elif args.supervise:
+        with open("config.json", encoding='utf-8') as f:
+            supervisor_config = json.load(f).get('supervisor', {})
+        supervisor = Supervisor(
+            heartbeat_file=supervisor_config.get('heartbeat_file', "manga_heartbeat.json"),
+            heartbeat_timeout=supervisor_config.get('heartbeat_timeout', 600),
+            base_cooldown=supervisor_config.get('base_cooldown', 5),
+            max_cooldown=supervisor_config.get('max_cooldown', 300),
+            stable_after=supervisor_config.get('stable_after', 600)
+        )
+        sys.exit(supervisor.run())
     else:
-        bot = MangaReader()
-        bot.run()
+        bot = MangaReader(non_interactive=args.non_interactive)
+        sys.exit(bot.run())
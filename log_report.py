@@ -0,0 +1,194 @@
+import argparse
+import csv
+import datetime
+import heapq
+import re
+import sys
+from collections import Counter
+
+LINE_PATTERN = re.compile(r'^\[USER:(?P<user>[^\]]*)\]\[(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (?P<message>.*)$')
+LOAD_ERROR_PATTERN = re.compile(r'^Ошибка загрузки \((\d+)/(\d+)\)')
+ERROR_PREFIXES = ("Ошибка", "Критическая", "Не удалось", "Операция", "Сайт недоступен", "Загружены не все")
+MAX_CLASSES = 500
+
+# Фаза, в которую переходит бот после сообщения с этим началом.
+# Время между соседними строками лога относится к текущей фазе.
+PHASE_MARKERS = (
+    ("Запуск бота", "startup"),
+    ("Попытка входа", "login"),
+    ("Открываем главу", "chapter"),
+    ("Глава том", "between_chapters"),
+    ("Начинаем чтение манги", "title_setup"),
+    ("Закончили чтение манги", "catalog"),
+    ("Сайт недоступен", "outage"),
+    ("Плановый перезапуск браузера", "browser_restart"),
+    ("Перезапуск браузера после зависания", "browser_restart"),
+)
+
+def normalize(message):
+    """Класс сообщения: текст до двоеточия без изменчивых частей (числа, URL, идентификаторы)"""
+    text = re.sub(r'https?://\S+', '<url>', message.split(': ', 1)[0])
+    text = re.sub(r'0x[0-9a-fA-F]+|[0-9a-fA-F]{16,}|\d+', '#', text)
+    return re.sub(r'\s+', ' ', text).strip()[:80]
+
+class LogStats:
+    """Потоковая статистика по логу бота: память не зависит от размера файла"""
+    def __init__(self, user=None, since=None, stall_count=10):
+        self.user = user
+        self.since = since
+        self.stall_count = stall_count
+        self.first_time = None
+        self.last_time = None
+        self.last_message = None
+        self.phase = "startup"
+        self.lines = 0
+        self.chapters = 0
+        self.chapters_per_hour = Counter()
+        self.titles_started = 0
+        self.titles_completed = 0
+        self.phase_seconds = Counter()
+        self.classes = Counter()
+        self.load_retries = 0
+        self.load_failures = 0
+        self.stalls = []
+
+    def feed(self, line):
+        match = LINE_PATTERN.match(line.rstrip('\r\n'))
+        if not match:
+            return
+        if self.user and not match.group('user').startswith(self.user):
+            return
+        try:
+            timestamp = datetime.datetime.strptime(match.group('time'), "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return
+        if self.since and timestamp < self.since:
+            return
+
+        message = match.group('message')
+        self.lines += 1
+        if self.first_time is None:
+            self.first_time = timestamp
+
+        if self.last_time is not None:
+            gap = (timestamp - self.last_time).total_seconds()
+            if gap >= 0:
+                phase = "down" if message.startswith("Запуск бота") else self.phase
+                self.phase_seconds[phase] += gap
+                if self.stall_count > 0:
+                    stall = (gap, self.last_time.strftime("%Y-%m-%d %H:%M:%S"), self.last_message[:120])
+                    if len(self.stalls) < self.stall_count:
+                        heapq.heappush(self.stalls, stall)
+                    elif gap > self.stalls[0][0]:
+                        heapq.heapreplace(self.stalls, stall)
+        self.last_time = timestamp
+        self.last_message = message
+
+        for prefix, phase in PHASE_MARKERS:
+            if message.startswith(prefix):
+                self.phase = phase
+                break
+
+        if message.startswith("Глава том") and "успешно обработана" in message:
+            self.chapters += 1
+            self.chapters_per_hour[timestamp.strftime("%Y-%m-%d %H:00")] += 1
+        elif message.startswith("Начинаем чтение манги"):
+            self.titles_started += 1
+        elif message.startswith("Закончили чтение манги"):
+            self.titles_completed += 1
+
+        load_error = LOAD_ERROR_PATTERN.match(message)
+        if load_error:
+            if load_error.group(1) == load_error.group(2):
+                self.load_failures += 1
+            else:
+                self.load_retries += 1
+
+        message_class = normalize(message)
+        if message_class in self.classes or len(self.classes) < MAX_CLASSES:
+            self.classes[message_class] += 1
+        else:
+            self.classes["<другие>"] += 1
+
+    @property
+    def hours(self):
+        if self.first_time is None:
+            return 0
+        return max((self.last_time - self.first_time).total_seconds() / 3600, 1 / 60)
+
+    def error_classes(self):
+        return [(name, count) for name, count in self.classes.most_common() if name.startswith(ERROR_PREFIXES)]
+
+    def print_summary(self, out):
+        if not self.lines:
+            print("В логе нет подходящих записей", file=out)
+            return
+
+        hours = self.hours
+        print(f"Период: {self.first_time} - {self.last_time} ({hours:.1f} ч, строк: {self.lines})", file=out)
+        print(f"Глав прочитано: {self.chapters} ({self.chapters / hours:.1f} в час)", file=out)
+        print(f"Тайтлов начато/закончено: {self.titles_started}/{self.titles_completed}", file=out)
+        print(f"Повторов загрузки: {self.load_retries}, неудачных загрузок: {self.load_failures}"
+              f" ({self.load_failures / max(self.chapters, 1):.2f} на главу)", file=out)
+
+        print("\nГлав в час:", file=out)
+        for hour, count in sorted(self.chapters_per_hour.items()):
+            print(f"  {hour}  {count:4d}  {'#' * min(count, 60)}", file=out)
+
+        print("\nВремя по фазам:", file=out)
+        total = sum(self.phase_seconds.values()) or 1
+        for phase, seconds in self.phase_seconds.most_common():
+            print(f"  {phase:<18} {seconds / 3600:8.2f} ч  {seconds / total:6.1%}", file=out)
+
+        print("\nОшибки по классам:", file=out)
+        for name, count in self.error_classes()[:20]:
+            print(f"  {count:6d}  {count / hours:7.2f}/ч  {name}", file=out)
+
+        print("\nСамые долгие паузы в логе:", file=out)
+        for gap, started, message in sorted(self.stalls, reverse=True):
+            print(f"  {gap / 60:7.1f} мин с {started}: {message}", file=out)
+
+    def write_csv(self, table, out):
+        writer = csv.writer(out)
+        hours = self.hours or 1
+        if table == "hourly":
+            writer.writerow(["hour", "chapters"])
+            writer.writerows(sorted(self.chapters_per_hour.items()))
+        elif table == "phases":
+            writer.writerow(["phase", "seconds"])
+            writer.writerows((phase, round(seconds)) for phase, seconds in self.phase_seconds.most_common())
+        elif table == "classes":
+            writer.writerow(["class", "count", "per_hour", "is_error"])
+            for name, count in self.classes.most_common():
+                writer.writerow([name, count, round(count / hours, 3), name.startswith(ERROR_PREFIXES)])
+        elif table == "stalls":
+            writer.writerow(["seconds", "started", "message"])
+            writer.writerows((round(gap), started, message) for gap, started, message in sorted(self.stalls, reverse=True))
+
+def main():
+    parser = argparse.ArgumentParser(description="Отчет о производительности MangaBot по manga_bot_log.txt")
+    parser.add_argument("log", nargs="?", default="manga_bot_log.txt", help="файл лога ('-' - stdin)")
+    parser.add_argument("--user", help="только записи пользователя с этим ID (префикс)")
+    parser.add_argument("--since", help="только записи начиная с даты, YYYY-MM-DD")
+    parser.add_argument("--stalls", type=int, default=10, help="сколько самых долгих пауз показать")
+    parser.add_argument("--csv", choices=["hourly", "phases", "classes", "stalls"], help="вывести таблицу в CSV")
+    args = parser.parse_args()
+
+    since = datetime.datetime.strptime(args.since, "%Y-%m-%d") if args.since else None
+    stats = LogStats(user=args.user, since=since, stall_count=args.stalls)
+
+    if args.log == "-":
+        for line in sys.stdin:
+            stats.feed(line)
+    else:
+        with open(args.log, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                stats.feed(line)
+
+    if args.csv:
+        stats.write_csv(args.csv, sys.stdout)
+    else:
+        stats.print_summary(sys.stdout)
+
+if __name__ == "__main__":
+    main()
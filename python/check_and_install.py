@@ -1,12 +1,41 @@
 import sys
+import os
+import hashlib
+import argparse
 import subprocess
 import importlib.metadata
 from time import sleep
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STAMP_FILE = os.path.join(SCRIPT_DIR, ".deps_installed")
+DEFAULT_WHEELHOUSE = os.path.join(SCRIPT_DIR, "wheels")
+
+def requirements_hash(packages):
+    """Hash of the pinned set and the interpreter it was installed into"""
+    key = "\n".join(sorted(packages) + [sys.executable, sys.version])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def is_up_to_date(packages):
+    try:
+        with open(STAMP_FILE, encoding="utf-8") as f:
+            return f.read().strip() == requirements_hash(packages)
+    except OSError:
+        return False
+
+def write_stamp(packages):
+    try:
+        with open(STAMP_FILE, "w", encoding="utf-8") as f:
+            f.write(requirements_hash(packages))
+    except OSError as e:
+        print(f"[!] Could not write {STAMP_FILE}: {str(e)}")
+
 def is_package_installed(package_spec):
-    package_name = package_spec.split('==')[0]
+    package_name, _, wanted = package_spec.partition('==')
     try:
         version = importlib.metadata.version(package_name)
+        if wanted and version != wanted:
+            print(f"[~] {package_name} {version} installed, {wanted} required")
+            return False
         print(f"[✓] {package_name} already installed (version {version})")
         return True
     except importlib.metadata.PackageNotFoundError:
@@ -15,43 +44,58 @@ def is_package_installed(package_spec):
         print(f"[!] Error checking {package_name}: {str(e)}")
         return False
 
-def install_package(package_spec):
-    print(f"[~] Installing {package_spec}...")
+def install_packages(package_specs, wheelhouse=None):
+    print(f"[~] Installing {', '.join(package_specs)}...")
+    command = [sys.executable, "-m", "pip", "install", "--disable-pip-version-check"]
+    if wheelhouse:
+        print(f"[~] Using offline wheelhouse {wheelhouse}")
+        command += ["--no-index", "--find-links", wheelhouse]
     try:
-        result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", package_spec],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        
-        if "Successfully installed" in result.stdout:
-            print(f"[✓] {package_spec} installed successfully")
-            return True
-        return False
+        subprocess.run(command + package_specs, check=True, capture_output=True, text=True)
+        print(f"[✓] Installed {len(package_specs)} package(s) successfully")
+        return True
     except subprocess.CalledProcessError as e:
         print(f"[X] Install failed: {e.stderr}")
         return False
 
+def pause():
+    if sys.stdin.isatty():
+        input("\nPress Enter to exit...")
+
 def main():
-    print("\n=== Python 3.13 Dependencies Installation ===")
+    parser = argparse.ArgumentParser(description="Install MangaRead dependencies")
+    parser.add_argument("--wheelhouse", default=os.environ.get("MANGAREAD_WHEELHOUSE"),
+                        help="directory with pre-downloaded wheels (installs without network)")
+    parser.add_argument("--force", action="store_true", help="re-check packages even if the stamp is current")
+    args = parser.parse_args()
+
     required_packages = [
         "selenium==4.18.1",
         "requests==2.31.0",
         "webdriver-manager==4.0.1",
         "colorama==0.4.6",
-        "pycryptodome==3.22.0"
+        "pycryptodome==3.22.0",
+        "psutil==5.9.8"
     ]
-    
-    for package in required_packages:
-        if not is_package_installed(package):
-            if not install_package(package):
-                print(f"[X] Critical error installing {package}")
-                input("\nPress Enter to exit...")
-                sys.exit(1)
-    
+
+    if not args.force and is_up_to_date(required_packages):
+        print("[✓] Dependencies are up to date")
+        return
+
+    print("\n=== Python 3.13 Dependencies Installation ===")
+    wheelhouse = args.wheelhouse
+    if not wheelhouse and os.path.isdir(DEFAULT_WHEELHOUSE):
+        wheelhouse = DEFAULT_WHEELHOUSE
+
+    missing = [package for package in required_packages if not is_package_installed(package)]
+    if missing and not install_packages(missing, wheelhouse):
+        print(f"[X] Critical error installing {', '.join(missing)}")
+        pause()
+        sys.exit(1)
+
+    write_stamp(required_packages)
     print("\n[✓] All dependencies installed successfully!")
-    input("\nPress Enter to exit...")
+    pause()
 
 if __name__ == "__main__":
     main()